@@ -3,8 +3,8 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass, field
 import threading
+from dataclasses import dataclass, field
 from typing import Any
 from uuid import uuid4
 
@@ -13,13 +13,13 @@ from autospider.platform.llm.trace_stats import collect_trace_stats
 from autospider.platform.persistence.redis.pool import get_sync_client
 from autospider.platform.persistence.sql.orm.engine import init_db
 from autospider.platform.shared_kernel.grouping_semantics import normalize_grouping_semantics
+from autospider.platform.shared_kernel.utils import event_loop
+
 from .resume import ResumeRun
 from .run_chat_pipeline import RunChatPipeline
 
 _AUTO_RESUME_LIMIT = 12
-_DEFAULT_CLARIFICATION_ANSWER = (
-    "请严格按当前 benchmark 请求执行；如果页面存在分类、Tab 或频道切换，需要覆盖所有相关分类，不要只采集当前默认分类。"
-)
+_DEFAULT_CLARIFICATION_ANSWER = "请严格按当前 benchmark 请求执行；如果页面存在分类、Tab 或频道切换，需要覆盖所有相关分类，不要只采集当前默认分类。"
 
 
 class BenchmarkRuntimeUnavailable(RuntimeError):
@@ -42,9 +42,9 @@ class _StepTotals:
             normalized_name = str(node_name).strip()
             if not normalized_name:
                 continue
-            self.graph_steps_by_node[normalized_name] = (
-                self.graph_steps_by_node.get(normalized_name, 0) + _as_int(count)
-            )
+            self.graph_steps_by_node[normalized_name] = self.graph_steps_by_node.get(
+                normalized_name, 0
+            ) + _as_int(count)
 
     def apply(self, graph_result: GraphResult) -> GraphResult:
         summary = dict(graph_result.summary or {})
@@ -226,7 +226,7 @@ def _run_async_safely(coro: Any) -> Any:
     try:
         asyncio.get_running_loop()
     except RuntimeError:
-        return asyncio.run(coro)
+        return event_loop.run(coro)
     return _run_in_thread(coro)
 
 
@@ -234,7 +234,7 @@ def _run_in_thread(coro: Any) -> Any:
     result_holder: dict[str, object] = {"result": None, "error": None}
 
     def _runner() -> None:
-        loop = asyncio.new_event_loop()
+        loop = event_loop.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
             result_holder["result"] = loop.run_until_complete(coro)
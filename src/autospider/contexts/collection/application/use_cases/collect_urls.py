@@ -3,29 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+from functools import cached_property
 from typing import TYPE_CHECKING
 
-from autospider.platform.config.runtime import config
-from autospider.platform.observability.logger import get_logger
-from autospider.platform.browser.som import (
-    capture_screenshot_with_marks,
-    clear_overlay,
-    inject_and_scan,
-)
-from autospider.platform.persistence.files.idempotent_io import (
-    write_json_idempotent,
-    write_text_if_changed,
-)
-from autospider.platform.shared_kernel.knowledge_contracts import build_list_profile_key
 from autospider.contexts.collection.application.use_cases.explore_site import (
     build_detail_visit,
     extract_mark_id_text_map,
     prepare_explore_skill_context,
     resolve_selected_mark_ids,
 )
-from autospider.contexts.collection.infrastructure.repositories.config_repository import (
-    CollectionConfig,
-)
 from autospider.contexts.collection.infrastructure.crawler.base.base_collector import BaseCollector
 from autospider.contexts.collection.infrastructure.crawler.collector import (
     CommonPattern,
@@ -35,9 +21,29 @@ from autospider.contexts.collection.infrastructure.crawler.collector import (
     URLCollectorResult,
     smart_scroll,
 )
+from autospider.contexts.collection.infrastructure.repositories.config_repository import (
+    CollectionConfig,
+)
+from autospider.platform.browser.som import (
+    capture_screenshot_with_marks,
+    clear_overlay,
+    inject_and_scan,
+)
+from autospider.platform.config.runtime import config
+from autospider.platform.observability.logger import get_logger
+from autospider.platform.persistence.files.idempotent_io import (
+    write_json_idempotent,
+    write_text_if_changed,
+)
+from autospider.platform.shared_kernel.knowledge_contracts import build_list_profile_key
+
 from .explore_dependencies import (
+    CollectionDeciderLike,
     CollectionExploreDependencies,
+    ConfigPersistenceLike,
+    ScriptGeneratorLike,
     SkillRuntimeLike,
+    XPathExtractorLike,
     build_collection_explore_dependencies,
 )
 
@@ -98,13 +104,10 @@ class URLCollector(BaseCollector):
 
         self.explore_count = explore_count
         self.max_nav_steps = max_nav_steps
-        resolved_dependencies = explore_dependencies or build_collection_explore_dependencies(
-            output_dir=output_dir,
-            skill_runtime=skill_runtime,
-        )
-        if resolved_dependencies.script_generator is None:
+        if explore_dependencies is not None and explore_dependencies.script_generator is None:
             raise ValueError("collection_explore_dependencies_missing_script_generator")
-        self.skill_runtime = resolved_dependencies.skill_runtime
+        self._injected_explore_dependencies = explore_dependencies
+        self._skill_runtime_override = skill_runtime
         self.selected_skills_context = str(selected_skills_context or "")
         self.selected_skills = list(selected_skills or [])
         self.initial_nav_steps = list(initial_nav_steps or [])
@@ -121,7 +124,9 @@ class URLCollector(BaseCollector):
                 else None
             )
         elif isinstance(initial_collection_config, dict) and initial_collection_config:
-            self.initial_collection_config = CollectionConfig.from_mapping(initial_collection_config)
+            self.initial_collection_config = CollectionConfig.from_mapping(
+                initial_collection_config
+            )
             self.initial_collection_config_candidates = [self.initial_collection_config]
         else:
             self.initial_collection_config = initial_collection_config or None
@@ -145,10 +150,36 @@ class URLCollector(BaseCollector):
         self.visited_detail_urls: set[str] = set()
         self.common_pattern: CommonPattern | None = None
 
-        self.decider = resolved_dependencies.decider
-        self.script_generator = resolved_dependencies.script_generator
-        self.config_persistence = resolved_dependencies.config_persistence
-        self.xpath_extractor = resolved_dependencies.xpath_extractor
+    @cached_property
+    def _explore_dependencies(self) -> CollectionExploreDependencies:
+        # 默认依赖（LLMDecider / ScriptGenerator / SkillRuntime）在首次使用时才构建，
+        # 仅构造收集器（如 worker 预创建、dry-run）不会付出 LLM 客户端与配置读取的开销。
+        if self._injected_explore_dependencies is not None:
+            return self._injected_explore_dependencies
+        return build_collection_explore_dependencies(
+            output_dir=str(self.output_dir),
+            skill_runtime=self._skill_runtime_override,
+        )
+
+    @cached_property
+    def skill_runtime(self) -> SkillRuntimeLike:
+        return self._explore_dependencies.skill_runtime
+
+    @cached_property
+    def decider(self) -> CollectionDeciderLike:
+        return self._explore_dependencies.decider
+
+    @cached_property
+    def script_generator(self) -> ScriptGeneratorLike:
+        return self._explore_dependencies.script_generator
+
+    @cached_property
+    def config_persistence(self) -> ConfigPersistenceLike:
+        return self._explore_dependencies.config_persistence
+
+    @cached_property
+    def xpath_extractor(self) -> XPathExtractorLike:
+        return self._explore_dependencies.xpath_extractor
 
     def _log_run_start(self) -> None:
         initial_config = self.initial_collection_config
@@ -213,6 +244,8 @@ class URLCollector(BaseCollector):
                 str(getattr(self.pagination_handler, "pagination_xpath", "") or "") or "<empty>",
                 "yes" if getattr(self.pagination_handler, "jump_widget_xpath", None) else "no",
             )
+            # 画像命中时已在列表页完成导航重放与 XPath 预览，规则执行阶段可直接复用该状态
+            self._mark_list_page_state_fresh()
         else:
             logger.info("[URLCollector] profile=miss: fallback=llm_sample")
             await self._run_navigation_phase()
@@ -221,7 +254,10 @@ class URLCollector(BaseCollector):
 
         validation_pages = max(1, int(config.field_extractor.validate_count))
 
-        while not self.common_detail_xpath and self.pagination_handler.current_page_num <= self.max_pages:
+        while (
+            not self.common_detail_xpath
+            and self.pagination_handler.current_page_num <= self.max_pages
+        ):
             logger.info(
                 "[URLCollector] page=%s collect_start: urls=%s | detail_visits=%s | target=%s",
                 self.pagination_handler.current_page_num,
@@ -378,7 +414,9 @@ class URLCollector(BaseCollector):
             "[URLCollector] profile_candidate_check: profile_key=%s, candidates=%s, initial_config_type=%s, anchor_url=%s, page_state_signature=%s, variant_label=%s",
             str(self.profile_key or "") or "<empty>",
             len(candidates),
-            type(self.initial_collection_config).__name__ if self.initial_collection_config is not None else "None",
+            type(self.initial_collection_config).__name__
+            if self.initial_collection_config is not None
+            else "None",
             str(self.anchor_url or "") or "<empty>",
             str(self.page_state_signature or "") or "<empty>",
             str(self.variant_label or "") or "<empty>",
@@ -783,4 +821,3 @@ async def collect_detail_urls(
         explore_dependencies=explore_dependencies,
     )
     return await collector.run()
-
@@ -5,8 +5,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from autospider.platform.config.runtime import config
-from autospider.platform.observability.logger import get_logger
+from autospider.contexts.collection.infrastructure.crawler.collector import (
+    DetailPageVisit,
+    smart_scroll,
+)
 from autospider.platform.browser.som import (
     capture_screenshot_with_marks,
     clear_overlay,
@@ -16,7 +18,9 @@ from autospider.platform.browser.som.text_first import (
     resolve_mark_ids_from_map,
     resolve_single_mark_id,
 )
-from autospider.contexts.collection.infrastructure.crawler.collector import DetailPageVisit, smart_scroll
+from autospider.platform.config.runtime import config
+from autospider.platform.observability.logger import get_logger
+
 from .explore_dependencies import SkillRuntimeLike
 
 if TYPE_CHECKING:
@@ -65,6 +69,14 @@ async def prepare_explore_skill_context(
     )
 
 
+def _has_selection(decision_args: dict[str, Any]) -> bool:
+    return bool(
+        decision_args.get("items")
+        or decision_args.get("mark_id_text_map")
+        or decision_args.get("mark_ids")
+    )
+
+
 async def run_detail_explore_loop(
     *,
     page: Any,
@@ -80,6 +92,9 @@ async def run_detail_explore_loop(
     attempts = 0
     consecutive_bottom_hits = 0
     max_bottom_hits = 3
+    reuse_observation = False
+    snapshot: Any = None
+    screenshot_base64 = ""
 
     while explored < explore_count and attempts < max_attempts:
         attempts += 1
@@ -91,14 +106,18 @@ async def run_detail_explore_loop(
             explore_count,
         )
 
-        logger.info("[Explore] 扫描页面...")
-        await clear_overlay(page)
-        snapshot = await inject_and_scan(page)
-        screenshot_bytes, screenshot_base64 = await capture_screenshot_with_marks(page)
+        if reuse_observation:
+            logger.info("[Explore] 页面未变化，复用上一轮扫描结果")
+        else:
+            logger.info("[Explore] 扫描页面...")
+            await clear_overlay(page)
+            snapshot = await inject_and_scan(page)
+            screenshot_bytes, screenshot_base64 = await capture_screenshot_with_marks(page)
 
-        screenshot_path = screenshots_dir / f"explore_{attempts:03d}.png"
-        screenshot_path.write_bytes(screenshot_bytes)
-        logger.info("[Explore] 截图已保存: %s", screenshot_path.name)
+            screenshot_path = screenshots_dir / f"explore_{attempts:03d}.png"
+            screenshot_path.write_bytes(screenshot_bytes)
+            logger.info("[Explore] 截图已保存: %s", screenshot_path.name)
+        reuse_observation = False
 
         logger.info("[Explore] 调用 LLM 决策...")
         llm_decision = await llm_decision_maker.ask_for_decision(snapshot, screenshot_base64)
@@ -131,12 +150,14 @@ async def run_detail_explore_loop(
                 explored += 1
                 consecutive_bottom_hits = 0
             else:
-                if not await smart_scroll(page):
+                if await smart_scroll(page):
+                    consecutive_bottom_hits = 0
+                else:
                     consecutive_bottom_hits += 1
+                    # LLM 每轮的输出会变化，未滚动的页面仍值得再扫描几轮
                     if consecutive_bottom_hits >= max_bottom_hits:
+                        logger.info("[Explore] ⚠ 连续到达页面底部且无新进展，停止探索")
                         break
-                else:
-                    consecutive_bottom_hits = 0
             continue
 
         if decision_type == "select" and (decision_args.get("purpose") or "").lower() in {
@@ -151,12 +172,16 @@ async def run_detail_explore_loop(
                 explored = new_explored
                 consecutive_bottom_hits = 0
             else:
-                if not await smart_scroll(page):
+                if await smart_scroll(page):
+                    consecutive_bottom_hits = 0
+                else:
                     consecutive_bottom_hits += 1
+                    # LLM 每轮的输出会变化，未滚动的页面仍值得再扫描几轮
                     if consecutive_bottom_hits >= max_bottom_hits:
+                        logger.info("[Explore] ⚠ 连续到达页面底部且无新进展，停止探索")
                         break
-                else:
-                    consecutive_bottom_hits = 0
+                    # LLM 未选中任何元素且页面未滚动时页面状态不变，下一轮只重新询问 LLM
+                    reuse_observation = not _has_selection(decision_args)
             continue
 
         if decision_type == "click":
@@ -171,6 +196,7 @@ async def run_detail_explore_loop(
             else:
                 consecutive_bottom_hits += 1
                 if consecutive_bottom_hits >= max_bottom_hits:
+                    logger.info("[Explore] ⚠ 连续到达页面底部，停止探索")
                     break
 
 
@@ -14,36 +14,43 @@ import asyncio
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import TYPE_CHECKING
+from urllib.parse import urldefrag
 
+from autospider.platform.browser.som import (
+    capture_screenshot_with_marks,
+    clear_overlay,
+    inject_and_scan,
+)
+from autospider.platform.browser.som.text_first import resolve_mark_ids_from_map
 from autospider.platform.config.runtime import config
 from autospider.platform.observability.logger import get_logger
+
 from ..checkpoint import AdaptiveRateController
 from ..checkpoint.resume_strategy import ResumeCoordinator
 from ..collector import (
-    URLCollectorResult,
     LLMDecisionMaker,
-    URLExtractor,
     NavigationHandler,
     PaginationHandler,
+    URLCollectorResult,
+    URLExtractor,
     smart_scroll,
 )
-from autospider.platform.browser.som import (
-    capture_screenshot_with_marks,
-    clear_overlay,
-    inject_and_scan,
-)
-from autospider.platform.browser.som.text_first import resolve_mark_ids_from_map
 from .progress_store import ProgressStore
 from .url_publish_service import UrlPublishService
 
 if TYPE_CHECKING:
     from playwright.async_api import Page
+
     from autospider.contexts.collection.infrastructure.channel.base import URLChannel
 
 # 日志器
 logger = get_logger(__name__)
 
 
+def _strip_fragment(url: str) -> str:
+    return urldefrag(str(url or "")).url
+
+
 class BaseCollector(ABC):
     """URL 收集器基类
 
@@ -85,10 +92,9 @@ class BaseCollector(ABC):
         self.execution_brief = dict(execution_brief or {})
         self.persist_progress = bool(persist_progress)
 
-        # 初始化输出路径
+        # 初始化输出路径（目录在 _initialize_handlers 中按需创建，构造阶段不触碰文件系统）
         self.output_dir = Path(output_dir)
         self.screenshots_dir = self.output_dir / "screenshots"
-        self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
         # 运行时数据存储
         self.collected_urls: list[str] = []
@@ -96,6 +102,9 @@ class BaseCollector(ABC):
         self.nav_steps: list[dict] = []
         # 存储自动发现的详情页 XPath，若存在则优先使用 XPath 模式提高效率
         self.common_detail_xpath: str | None = None
+        # 列表页是否刚完成导航 + 筛选重放且尚未离开（用于跳过采集阶段的重复 goto + 重放）
+        self._list_page_state_fresh = False
+        self._list_page_state_url = ""
 
         # 目标采集数量（可由调用方覆盖配置）
         self.target_url_count = (
@@ -126,6 +135,8 @@ class BaseCollector(ABC):
 
         此方法通常在子类的 run 方法开始时调用，以确保所有依赖组件都已就绪。
         """
+        self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+
         # 初始化 URL 提取器
         self.url_extractor = URLExtractor(self.page, self.list_url)
 
@@ -252,6 +263,23 @@ class BaseCollector(ABC):
         actual_page = await coordinator.resume_to_page(self.page, target_page_num)
         return actual_page
 
+    def _mark_list_page_state_fresh(self) -> None:
+        """标记列表页已处于采集起点（已导航并完成筛选重放）。"""
+        self._list_page_state_fresh = True
+        self._list_page_state_url = _strip_fragment(getattr(self.page, "url", "") or "")
+
+    def _consume_list_page_state_fresh(self) -> bool:
+        """判断能否直接复用当前列表页状态，而无需重新 goto + 重放导航步骤。
+
+        标记只生效一次；当前页面 URL 与标记时不一致（期间发生了跳转）则视为失效。
+        """
+        fresh = self._list_page_state_fresh
+        self._list_page_state_fresh = False
+        if not fresh:
+            return False
+        current_url = _strip_fragment(getattr(self.page, "url", "") or "")
+        return bool(current_url) and current_url == self._list_page_state_url
+
     async def _collect_phase_with_xpath(self) -> None:
         """基于 XPath 模板的高效采集阶段
 
@@ -265,6 +293,8 @@ class BaseCollector(ABC):
             logger.info(
                 f"断点恢复：从当前页面继续收集（第 {self.pagination_handler.current_page_num} 页）"
             )
+        elif self._consume_list_page_state_fresh():
+            logger.info("列表页已处于采集起点，跳过重新导航与导航步骤重放")
         else:
             logger.info("返回列表页开始位置...")
             await self.page.goto(self.list_url, wait_until="domcontentloaded", timeout=30000)
@@ -345,7 +375,7 @@ class BaseCollector(ABC):
                     url = await self.url_extractor.extract_from_locator(locator, self.nav_steps)
                     if url and url not in self.collected_urls:
                         if await self.remember_collected_url(url):
-                            logger.info(f"✓ [{i+1}/{count}] {url[:60]}...")
+                            logger.info(f"✓ [{i + 1}/{count}] {url[:60]}...")
 
             return len(self.collected_urls) > urls_before
 
@@ -364,6 +394,8 @@ class BaseCollector(ABC):
             logger.info(
                 f"断点恢复：从当前页面继续收集（第 {self.pagination_handler.current_page_num} 页）"
             )
+        elif self._consume_list_page_state_fresh():
+            logger.info("列表页已处于采集起点，跳过重新导航与导航步骤重放")
         else:
             logger.info("返回列表页开始位置...")
             await self.page.goto(self.list_url, wait_until="domcontentloaded", timeout=30000)
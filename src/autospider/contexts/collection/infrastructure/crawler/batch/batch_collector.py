@@ -10,23 +10,25 @@ import asyncio
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from autospider.platform.observability.logger import get_logger
 from autospider.contexts.collection.infrastructure.repositories.config_repository import (
     CollectionConfig,
     ConfigPersistence,
     load_collection_config,
 )
+from autospider.platform.llm.decider import LLMDecider
+from autospider.platform.observability.logger import get_logger
 from autospider.platform.persistence.files.idempotent_io import write_json_idempotent
+
+from ..base.base_collector import BaseCollector
 from ..collector import (
-    URLCollectorResult,
     LLMDecisionMaker,
     NavigationHandler,
+    URLCollectorResult,
 )
-from autospider.platform.llm.decider import LLMDecider
-from ..base.base_collector import BaseCollector
 
 if TYPE_CHECKING:
     from playwright.async_api import Page
+
     from autospider.contexts.collection.infrastructure.channel.base import URLChannel
 
 # 日志器
@@ -161,6 +163,7 @@ class BatchCollector(BaseCollector):
         self._initialize_handlers()
 
         # 2. 重放导航步骤（如果有）
+        nav_success = True
         if self.nav_steps:
             logger.info("\n[Phase 2] 重放导航步骤...")
             nav_success = await self.navigation_handler.replay_nav_steps(self.nav_steps)
@@ -172,6 +175,10 @@ class BatchCollector(BaseCollector):
                 new_list_url = self.navigation_handler.list_url or new_page.url
                 self._sync_page_references(new_page, list_url=new_list_url)
 
+        # 列表页已就绪：收集阶段无需再次 goto + 重放
+        if nav_success and target_page_num <= 1:
+            self._mark_list_page_state_fresh()
+
         # 3. 断点恢复：跳转到目标页
         if target_page_num > 1:
             logger.info(f"\n[Phase 3] 断点恢复：尝试跳转到第 {target_page_num} 页...")
@@ -83,7 +83,6 @@ class CollectionProgress:
 class ProgressPersistence:
     def __init__(self, output_dir: str | Path = "output"):
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
         self.progress_file = self.output_dir / "progress.json"
 
     def save_progress(self, progress: CollectionProgress) -> None:
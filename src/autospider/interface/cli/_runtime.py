@@ -6,6 +6,8 @@ import logging
 import threading
 from typing import Any
 
+from autospider.platform.shared_kernel.utils import event_loop
+
 from ._runtime_support import cli_runtime
 
 logger = logging.getLogger(__name__)
@@ -15,7 +17,7 @@ def run_async_safely(coro: Any) -> Any:
     try:
         asyncio.get_running_loop()
     except RuntimeError:
-        return asyncio.run(coro)
+        return event_loop.run(coro)
     return _run_in_thread(coro)
 
 
@@ -112,7 +114,7 @@ def _run_in_thread(coro: Any) -> Any:
     result_holder: dict[str, object] = {"result": None, "error": None}
 
     def _runner() -> None:
-        loop = asyncio.new_event_loop()
+        loop = event_loop.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
             result_holder["result"] = loop.run_until_complete(coro)
@@ -12,7 +12,27 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from playwright.async_api import Locator
 
-from .page_handle import coerce_context_pages
+from .page_handle import (
+    coerce_context_pages,
+    coerce_guarded_page,
+    get_page_guard,
+    unwrap_page,
+)
+from .task_utils import wait_event
+
+
+async def _poll_new_page(page: Any, pages_before: int, wait_seconds: float) -> Any | None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait_seconds
+    while loop.time() < deadline:
+        try:
+            pages = coerce_context_pages(page)
+            if len(pages) > pages_before:
+                return pages[-1]
+        except Exception:
+            return None
+        await asyncio.sleep(0.05)
+    return None
 
 
 async def _capture_new_page_after_action(
@@ -23,21 +43,33 @@ async def _capture_new_page_after_action(
     load_state: str,
     load_timeout_ms: int,
 ) -> Any | None:
-    pages_before = len(coerce_context_pages(page))
-    new_page = None
-    await action()
-
     wait_seconds = max(0.0, expect_page_timeout_ms / 1000)
-    deadline = asyncio.get_running_loop().time() + wait_seconds
-    while asyncio.get_running_loop().time() < deadline:
+    context = getattr(unwrap_page(page), "context", None)
+    if not callable(getattr(context, "on", None)):
+        pages_before = len(coerce_context_pages(page))
+        await action()
+        new_page = await _poll_new_page(page, pages_before, wait_seconds)
+    else:
+        # 监听 context 的 page 事件：新页面出现即返回，不再每 50ms 轮询并重新包装全部页面
+        opened: list[Any] = []
+        page_opened = asyncio.Event()
+
+        def _on_page(raw_page: Any) -> None:
+            opened.append(raw_page)
+            page_opened.set()
+
+        context.on("page", _on_page)
         try:
-            pages = coerce_context_pages(page)
-            if len(pages) > pages_before:
-                new_page = pages[-1]
-                break
-        except Exception:
-            break
-        await asyncio.sleep(0.05)
+            await action()
+            await wait_event(page_opened, wait_seconds)
+        finally:
+            context.remove_listener("page", _on_page)
+        new_page = None
+        if opened:
+            guard = get_page_guard(page)
+            if guard is not None:
+                await guard.wait_page_setup(opened[0], 1.0)
+            new_page = coerce_guarded_page(opened[0], page)
 
     if new_page is not None:
         try:
@@ -60,10 +92,11 @@ async def click_and_capture_new_page(
     """点击定位器并捕获新打开的页面（如果有）。
 
     说明：
-    - 点击后短时间轮询 context.pages，检测是否出现新页面。
+    - 点击后短时间监听 context 的 page 事件，检测是否出现新页面。
     - 不使用 expect_page，避免事件 future 在关闭阶段残留未消费异常。
     - 此助手函数仅返回新页面；它不会切换或关闭页面。
     """
+
     async def _click() -> None:
         await locator.click(timeout=click_timeout_ms)
 
@@ -90,9 +123,10 @@ async def press_and_capture_new_page(
 
     说明：
     - 优先使用 locator.press；失败时回退到 page.keyboard.press。
-    - 通过轮询 context.pages 检测新页面，避免 expect_page 相关 future 噪音。
+    - 通过监听 context 的 page 事件检测新页面，避免 expect_page 相关 future 噪音。
     - 此助手函数仅返回新页面；它不会切换或关闭页面。
     """
+
     async def _press() -> None:
         try:
             await locator.press(key, timeout=press_timeout_ms)
@@ -7,14 +7,21 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import os
-from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Literal
+import signal
+import weakref
+from collections.abc import AsyncGenerator, Mapping
+from contextlib import asynccontextmanager, suppress
+from types import MappingProxyType
+from typing import Any, Literal
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
 
-from playwright.async_api import Browser, Page, Playwright, async_playwright
 from autospider.platform.observability.logger import get_logger
 
 from .guard import PageGuard
+from .guarded_page import GuardedPage
 from .task_utils import create_monitored_task
 
 logger = get_logger(__name__)
@@ -44,14 +51,33 @@ class BrowserEngine:
         default_browser_type: Literal["chromium", "firefox", "webkit"] = "chromium",
         max_retries: int = 2,
         default_timeout: int = 30000,
+        max_pool_size: int = 0,
+        max_uses_per_context: int = 20,
     ):
         self._playwright: Playwright | None = None
         self._browser: Browser | None = None
+        # 空闲 BrowserContext 池：按上下文参数分组复用，避免每次 page() 都新建/销毁 context。
+        # 复用的 context 保留上一位借用方的 Cookie、localStorage 与权限，因此默认关闭
+        # （max_pool_size=0），仅在所有调用方共享同一登录态时开启
+        self._context_pool: dict[tuple[Any, ...], list[BrowserContext]] = {}
+        self._context_uses: dict[int, int] = {}
+        # context -> 当前借用方的 PageGuard；"page" 监听器在 context 创建时只注册一次，按此表分发
+        self._context_guards: weakref.WeakKeyDictionary[BrowserContext, PageGuard] = (
+            weakref.WeakKeyDictionary()
+        )
+        # 已解析的 Cookie 文件：path -> (mtime, storage_state)，文件未变更时直接复用
+        self._storage_state_cache: dict[str, tuple[float, dict[str, Any]]] = {}
         self._stealth_context: Any | None = None
         self._playwright_started_direct = False
         self._current_headless = default_headless
-        self._lock = asyncio.Lock()
+        # asyncio.Lock 绑定首次争用时的 loop，跨 loop 复用会报错，因此每个 loop 各持一把
+        self._locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
         self._owner_loop: asyncio.AbstractEventLoop | None = None
+        # Playwright 连接绑定在创建它的事件循环上；切换 loop 时暂存旧 loop 的驱动与浏览器，
+        # 切回仍存活的 loop 时直接复用，而不是重新拉起 Node 驱动
+        self._parked_runtimes: dict[asyncio.AbstractEventLoop, tuple[Any, ...]] = {}
 
         self.default_headless = default_headless
         self.default_viewport = default_viewport or {"width": 1920, "height": 1080}
@@ -59,6 +85,8 @@ class BrowserEngine:
         self.default_browser_type = default_browser_type
         self.max_retries = max_retries
         self.default_timeout = default_timeout
+        self.max_pool_size = max(0, int(max_pool_size))
+        self.max_uses_per_context = max(1, int(max_uses_per_context))
         self.default_launch_args = default_launch_args or [
             "--no-sandbox",
             "--disable-setuid-sandbox",
@@ -67,16 +95,34 @@ class BrowserEngine:
             "--disable-extensions",
             "--no-first-run",
         ]
+        # 所有 context 共享的基础参数：只构造一次，page() 仅合并差异项
+        self._base_context_options: Mapping[str, Any] = MappingProxyType(
+            {
+                "viewport": self.default_viewport,
+                "user_agent": self.default_user_agent,
+                "ignore_https_errors": True,
+            }
+        )
 
     async def _ensure_browser(self, headless: bool) -> None:
         current_loop = asyncio.get_running_loop()
 
-        async with self._lock:
+        # 稳态快路径：同一 loop、同一 headless 且浏览器存活时无需进锁
+        browser = self._browser
+        if (
+            browser is not None
+            and self._owner_loop is current_loop
+            and self._current_headless == headless
+            and browser.is_connected()
+        ):
+            return
+
+        async with self._loop_lock():
+            if self._owner_loop is not None and self._owner_loop is not current_loop:
+                self._switch_loop(current_loop)
+
             should_restart = False
-            if self._browser and self._owner_loop and self._owner_loop != current_loop:
-                logger.warning("Event Loop changed. Restarting browser...")
-                should_restart = True
-            elif not self._browser or not self._browser.is_connected():
+            if not self._browser or not self._browser.is_connected():
                 should_restart = True
             elif self._current_headless != headless:
                 logger.info(f"Switching Headless Mode: {headless}")
@@ -85,20 +131,21 @@ class BrowserEngine:
             if not should_restart:
                 return
 
-            if self._browser and self._owner_loop == current_loop:
-                try:
+            if self._browser:
+                with suppress(Exception):
                     await self._browser.close()
-                except Exception:
-                    pass
+            self._forget_pooled_contexts()
 
             if not self._playwright:
-                if Stealth is not None:
+                # Stealth 的驱动级补丁针对 Chromium，其他内核直接启动以省去包装与注入开销
+                if Stealth is not None and self.default_browser_type == "chromium":
                     self._stealth_context = Stealth().use_async(async_playwright())
                     self._playwright = await self._stealth_context.__aenter__()
                     self._playwright_started_direct = False
                 else:
                     self._playwright = await async_playwright().start()
                     self._playwright_started_direct = True
+                self._owner_loop = current_loop
 
             for attempt in range(self.max_retries + 1):
                 try:
@@ -114,6 +161,13 @@ class BrowserEngine:
                     if attempt == self.max_retries:
                         raise exc
 
+    def _loop_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
     @asynccontextmanager
     async def page(
         self,
@@ -134,90 +188,297 @@ class BrowserEngine:
         if auth_file is None and auto_load_cookie:
             auth_file = os.path.join(os.getcwd(), ".auth", "default.json")
 
-        options: dict[str, Any] = {
-            "viewport": self.default_viewport,
-            "user_agent": self.default_user_agent,
-            "ignore_https_errors": True,
-            **context_kwargs,
-        }
+        overrides: dict[str, Any] = dict(context_kwargs)
         if proxy:
-            options["proxy"] = proxy
-        if auth_file and os.path.exists(auth_file):
-            logger.debug(f"[Engine] 自动加载 Cookie: {auth_file}")
-            options["storage_state"] = auth_file
-
-        context = await self._browser.new_context(**options)
-        page = await context.new_page()
-        page.set_default_timeout(timeout or self.default_timeout)
-        if apply_stealth_async is not None:
-            try:
-                await apply_stealth_async(page)
-            except Exception as exc:
-                logger.debug(f"[Engine] 应用 stealth_async 失败（可忽略）: {exc}")
-
+            overrides["proxy"] = proxy
+        options: dict[str, Any] = {**self._base_context_options, **overrides}
+        storage_key: tuple[str, float] | None = None
+        if auth_file:
+            loaded = self._load_storage_state(auth_file)
+            if loaded is not None:
+                logger.debug(f"[Engine] 自动加载 Cookie: {auth_file}")
+                options["storage_state"], storage_mtime = loaded
+                storage_key = (auth_file, storage_mtime)
+
+        pool_key = self._context_pool_key(overrides, storage_key)
+        context = await self._acquire_context(pool_key, options)
         guard = None
-        if enable_guard:
-            from .guarded_page import GuardedPage
-
-            guard = PageGuard(
-                intervention_mode=guard_intervention_mode,
-                thread_id=guard_thread_id,
-                handlers=handlers,
-            )
-            guard.attach_to_page(page)
-            create_monitored_task(
-                guard.run_inspection(page),
-                task_name="PageGuard.initial_inspection",
-            )
-
-            async def _setup_new_page(new_page: Page) -> None:
-                if apply_stealth_async is not None:
-                    try:
-                        await apply_stealth_async(new_page)
-                    except Exception as exc:
-                        logger.debug(f"[Engine] 新页面应用 stealth_async 失败（可忽略）: {exc}")
-                guard.attach_to_page(new_page)
-                create_monitored_task(
-                    guard.run_inspection(new_page),
-                    task_name="PageGuard.new_page_inspection",
-                )
+        # 页面创建失败时 context 状态未知，不放回池中而是直接关闭
+        page_ready = False
+        try:
+            page = await context.new_page()
+            page.set_default_timeout(timeout or self.default_timeout)
+            if apply_stealth_async is not None:
+                try:
+                    await apply_stealth_async(page)
+                except Exception as exc:
+                    logger.debug(f"[Engine] 应用 stealth_async 失败（可忽略）: {exc}")
 
-            def _on_new_page(new_page: Page) -> None:
-                create_monitored_task(
-                    _setup_new_page(new_page),
-                    task_name="BrowserEngine.setup_new_page",
+            if enable_guard:
+                guard = PageGuard(
+                    intervention_mode=guard_intervention_mode,
+                    thread_id=guard_thread_id,
+                    handlers=handlers,
                 )
+                guard.attach_to_page(page)
+                guard.inspect_in_background(page, "PageGuard.initial_inspection")
+                self._context_guards[context] = guard
 
-            context.on("page", _on_new_page)
-
-        try:
+            page_ready = True
             if enable_guard and guard:
                 yield GuardedPage(page, guard)
             else:
                 yield page
         finally:
+            self._context_guards.pop(context, None)
+            if guard is not None:
+                await guard.close()
+            await self._release_context(pool_key, context, reusable=page_ready)
+
+    def _on_context_page(self, new_page: Page) -> None:
+        try:
+            guard = self._context_guards.get(new_page.context)
+        except Exception:
+            return
+        if guard is None:
+            return
+        guard.begin_page_setup(new_page)
+        create_monitored_task(
+            self._setup_new_page(new_page, guard),
+            task_name="BrowserEngine.setup_new_page",
+        )
+
+    async def _setup_new_page(self, new_page: Page, guard: PageGuard) -> None:
+        try:
+            if apply_stealth_async is not None:
+                try:
+                    await apply_stealth_async(new_page)
+                except Exception as exc:
+                    logger.debug(f"[Engine] 新页面应用 stealth_async 失败（可忽略）: {exc}")
+            guard.attach_to_page(new_page)
+            guard.inspect_in_background(new_page, "PageGuard.new_page_inspection")
+        finally:
+            guard.finish_page_setup(new_page)
+
+    def _load_storage_state(self, auth_file: str) -> tuple[dict[str, Any] | str, float] | None:
+        """读取 Cookie 文件，按 mtime 缓存解析结果；文件不存在时返回 None。"""
+        try:
+            mtime = os.stat(auth_file).st_mtime
+        except OSError:
+            return None
+
+        cached = self._storage_state_cache.get(auth_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], mtime
+
+        try:
+            with open(auth_file, encoding="utf-8") as f:
+                storage_state = json.load(f)
+        except (OSError, ValueError) as exc:
+            # 解析失败时仍交给 Playwright 读取路径，保持原有报错行为
+            logger.debug(f"[Engine] 解析 Cookie 文件失败，回退为路径加载: {exc}")
+            self._storage_state_cache.pop(auth_file, None)
+            return auth_file, mtime
+
+        self._storage_state_cache[auth_file] = (mtime, storage_state)
+        return storage_state, mtime
+
+    def _context_pool_key(
+        self, overrides: dict[str, Any], storage_key: tuple[str, float] | None
+    ) -> tuple[Any, ...]:
+        # 基础参数对同一引擎恒定，只需按差异项分组；storage_state 用 (路径, mtime) 代替内容
+        overrides_repr = ""
+        if overrides:
+            overrides_repr = repr(sorted(overrides.items(), key=lambda item: item[0]))
+        return (id(self._browser), overrides_repr, storage_key)
+
+    async def _acquire_context(
+        self, pool_key: tuple[Any, ...], options: dict[str, Any]
+    ) -> BrowserContext:
+        idle_contexts = self._context_pool.get(pool_key)
+        while idle_contexts:
+            context = idle_contexts.pop()
+            if context.browser is self._browser and self._browser.is_connected():
+                return context
+            self._context_uses.pop(id(context), None)
+        context = await self._browser.new_context(**options)
+        self._context_uses[id(context)] = 0
+        context.on("page", self._on_context_page)
+        return context
+
+    async def _release_context(
+        self, pool_key: tuple[Any, ...], context: BrowserContext, *, reusable: bool = True
+    ) -> None:
+        uses = self._context_uses.get(id(context), 0) + 1
+        self._context_uses[id(context)] = uses
+        reusable = (
+            reusable
+            and uses < self.max_uses_per_context
+            and self.max_pool_size > 0
+            and self._browser is not None
+            and context.browser is self._browser
+            and self._browser.is_connected()
+        )
+        if reusable:
             try:
-                await page.close()
-                await context.close()
+                for open_page in list(context.pages):
+                    await open_page.close()
             except Exception:
-                pass
+                reusable = False
+        if reusable:
+            pooled_count = sum(len(contexts) for contexts in self._context_pool.values())
+            if pooled_count >= self.max_pool_size:
+                await self._evict_oldest_idle_context()
+            self._context_pool.setdefault(pool_key, []).append(context)
+            return
+
+        self._context_uses.pop(id(context), None)
+        with suppress(Exception):
+            await context.close()
+
+    async def _evict_oldest_idle_context(self) -> None:
+        # dict 保持插入顺序：最早出现的 key（如 Cookie 文件更新前的旧参数）最先被淘汰
+        for pool_key, contexts in list(self._context_pool.items()):
+            if not contexts:
+                self._context_pool.pop(pool_key, None)
+                continue
+            context = contexts.pop(0)
+            if not contexts:
+                self._context_pool.pop(pool_key, None)
+            self._context_uses.pop(id(context), None)
+            with suppress(Exception):
+                await context.close()
+            return
+
+    def _switch_loop(self, current_loop: asyncio.AbstractEventLoop) -> None:
+        """切换到新的事件循环。
+
+        Playwright 的 Connection/Transport 绑定在创建它的 loop 上，无法跨 loop 驱动。
+        旧 loop 仍存活时暂存其驱动与浏览器，切回时原样恢复；已关闭 loop 的运行时直接结束驱动进程。
+        """
+        previous_loop = self._owner_loop
+        if previous_loop is not None and self._playwright:
+            runtime = (
+                self._playwright,
+                self._stealth_context,
+                self._playwright_started_direct,
+                self._browser,
+                self._current_headless,
+            )
+            if previous_loop.is_closed():
+                _discard_closed_loop_runtime(runtime)
+            else:
+                self._parked_runtimes[previous_loop] = runtime
+        self._forget_pooled_contexts()
+        for loop in [loop for loop in self._parked_runtimes if loop.is_closed()]:
+            _discard_closed_loop_runtime(self._parked_runtimes.pop(loop))
+
+        parked = self._parked_runtimes.pop(current_loop, None)
+        if parked is not None:
+            logger.info("Event Loop changed. Reusing browser runtime of current loop")
+            (
+                self._playwright,
+                self._stealth_context,
+                self._playwright_started_direct,
+                self._browser,
+                self._current_headless,
+            ) = parked
+            self._owner_loop = current_loop
+            return
+
+        logger.warning("Event Loop changed. Starting browser runtime for new loop...")
+        self._playwright = None
+        self._stealth_context = None
+        self._playwright_started_direct = False
+        self._browser = None
+        self._owner_loop = None
+
+    def _forget_pooled_contexts(self) -> None:
+        self._context_pool.clear()
+        self._context_uses.clear()
+
+    async def _close_pooled_contexts(self) -> None:
+        pooled = [context for contexts in self._context_pool.values() for context in contexts]
+        self._forget_pooled_contexts()
+        for context in pooled:
+            with suppress(Exception):
+                await context.close()
 
     async def close(self) -> None:
         current_loop = asyncio.get_running_loop()
-        if self._browser and self._owner_loop == current_loop:
-            await self._browser.close()
-        if self._stealth_context and self._owner_loop == current_loop:
-            await self._stealth_context.__aexit__(None, None, None)
-        elif (
-            self._playwright
-            and self._playwright_started_direct
-            and self._owner_loop == current_loop
-        ):
-            await self._playwright.stop()
+        if self._owner_loop == current_loop:
+            await self._close_pooled_contexts()
+        else:
+            self._forget_pooled_contexts()
+
+        runtimes = list(self._parked_runtimes.items())
+        self._parked_runtimes.clear()
+        if self._owner_loop is not None and self._playwright:
+            runtimes.append(
+                (
+                    self._owner_loop,
+                    (
+                        self._playwright,
+                        self._stealth_context,
+                        self._playwright_started_direct,
+                        self._browser,
+                        self._current_headless,
+                    ),
+                )
+            )
         self._browser = None
         self._playwright = None
         self._stealth_context = None
         self._playwright_started_direct = False
+        self._owner_loop = None
+
+        for loop, runtime in runtimes:
+            if loop is current_loop:
+                await _shutdown_runtime(runtime)
+            elif not loop.is_closed():
+                # 驱动只能在所属 loop 上关闭：投递过去，待该 loop 运行时执行
+                asyncio.run_coroutine_threadsafe(_shutdown_runtime(runtime), loop)
+            else:
+                _discard_closed_loop_runtime(runtime)
+
+
+async def _shutdown_runtime(runtime: tuple[Any, ...]) -> None:
+    """关闭一组暂存的浏览器与 Playwright 驱动；必须在其所属的事件循环上执行。"""
+    playwright, stealth_context, started_direct, browser, _headless = runtime
+    try:
+        if browser is not None:
+            await browser.close()
+    except Exception as exc:
+        logger.debug(f"[Engine] 关闭浏览器失败（忽略）: {exc}")
+    try:
+        if stealth_context is not None:
+            await stealth_context.__aexit__(None, None, None)
+        elif playwright is not None and started_direct:
+            await playwright.stop()
+    except Exception as exc:
+        logger.debug(f"[Engine] 停止 Playwright 驱动失败（忽略）: {exc}")
+
+
+def _discard_closed_loop_runtime(runtime: tuple[Any, ...]) -> None:
+    """所属 loop 已关闭的运行时无法再走协议关闭，直接结束 Playwright 驱动进程。
+
+    驱动收到 SIGTERM 后会关闭它启动的浏览器；取不到驱动进程时只能随宿主进程退出回收。
+    """
+    playwright = runtime[0]
+    transport = getattr(getattr(playwright, "_connection", None), "_transport", None)
+    proc = getattr(transport, "_proc", None)
+    pid = getattr(proc, "pid", None)
+    if pid is None:
+        logger.warning("[Engine] 事件循环已关闭且无法定位驱动进程，浏览器将随主进程退出回收")
+        return
+    if getattr(proc, "returncode", None) is not None:
+        return
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError as exc:
+        logger.warning(f"[Engine] 结束已关闭事件循环的驱动进程失败: {exc}")
+        return
+    logger.info(f"[Engine] 事件循环已关闭，已结束其 Playwright 驱动进程 (pid={pid})")
 
 
 _browser_engine: BrowserEngine | None = None
@@ -5,17 +5,43 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import re
+import time
+import weakref
 from typing import Sequence
 
 from playwright.async_api import Page
+
 from autospider.platform.observability.logger import get_logger
 
 from .handlers.base import BaseAnomalyHandler
+from .handlers.snapshot import capture_page_snapshot
 from .intervention import BrowserInterventionRequired
-from .task_utils import create_monitored_task
+from .page_handle import bind_page_guard, get_page_guard
+from .task_utils import create_monitored_task, wait_event
 
 logger = get_logger(__name__)
 
+# 子 frame 导航到这些地址时才触发巡检（登录/认证类 iframe），避免广告等 iframe 刷屏
+_LOGIN_FRAME_URL_RE = re.compile(r"login|passport|signin|member|auth", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_login_frame_url(url: str) -> bool:
+    # 广告 iframe 往往反复导航到同一批地址，缓存匹配结果避免重复扫描 URL
+    return _LOGIN_FRAME_URL_RE.search(url) is not None
+
+
+def _should_inspect_frame(page: Page, frame) -> bool:
+    if frame == page.main_frame:
+        return True
+    frame_url = frame.url
+    # 广告/占位 iframe 多为空白页，直接跳过正则匹配
+    if not frame_url or frame_url == "about:blank":
+        return False
+    return _is_login_frame_url(frame_url)
+
 
 class PageGuard:
     """页面巡检员。"""
@@ -28,51 +54,116 @@ class PageGuard:
     ):
         self.intervention_mode = intervention_mode
         self.thread_id = thread_id
-        self.handlers = list(handlers or [])
+        # 按优先级排序（数值越小越优先），并发 detect 后取第一个命中的处理器
+        self.handlers = sorted(handlers or [], key=lambda handler: handler.priority)
+        self._probe_selectors = tuple(
+            dict.fromkeys(
+                selector for handler in self.handlers for selector in handler.probe_selectors
+            )
+        )
         self._is_handling = False
-        self._lock = asyncio.Lock()
-        self._poll_tasks: dict[int, asyncio.Task] = {}
+        self._inspecting_pages: weakref.WeakSet[Page] = weakref.WeakSet()
+        # 以 Page 对象为弱引用键：页面被回收后条目自动消失，也避免 id() 复用导致串号
+        self._poll_tasks: weakref.WeakKeyDictionary[Page, asyncio.Task] = (
+            weakref.WeakKeyDictionary()
+        )
         self._poll_interval_s = 1.0
+        # 连续多次未命中后轮询间隔指数退避，页面导航事件会重置退避
+        self._poll_max_interval_s = 30.0
+        self._poll_backoff_after = 3
+        self._idle_streak: weakref.WeakKeyDictionary[Page, int] = weakref.WeakKeyDictionary()
+        self._poll_wakeups: weakref.WeakKeyDictionary[Page, asyncio.Event] = (
+            weakref.WeakKeyDictionary()
+        )
+        # 同一页面的事件/轮询巡检合并：短时间内的多次触发只跑一次 detect()
+        self._inspection_debounce_s = 0.05
+        self._inspection_min_interval_s = 0.25
+        self._pending_inspections: weakref.WeakKeyDictionary[Page, asyncio.TimerHandle] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._last_inspection_at: weakref.WeakKeyDictionary[Page, float] = (
+            weakref.WeakKeyDictionary()
+        )
+        # 事件触发的巡检任务上限：巡检本身串行执行，积压过多只会占用调度器
+        self._max_inflight_inspections = 8
+        self._inflight_inspections: set[asyncio.Task] = set()
+        self._page_inspection_tasks: weakref.WeakKeyDictionary[Page, asyncio.Task] = (
+            weakref.WeakKeyDictionary()
+        )
+        # 没有待执行/执行中的事件巡检时置位；页面操作后据此判断是否需要等待 Guard 介入
+        self._settled_event = asyncio.Event()
+        self._settled_event.set()
+        # 新页面挂载（stealth 注入 + 挂载 Guard）完成信号，由 context 的 page 事件登记
+        self._page_setup_events: weakref.WeakKeyDictionary[Page, asyncio.Event] = (
+            weakref.WeakKeyDictionary()
+        )
         self._idle_event = asyncio.Event()
         self._idle_event.set()
         self._pending_intervention: BrowserInterventionRequired | None = None
 
-    async def run_inspection(self, page: Page) -> None:
+    async def run_inspection(self, page: Page) -> bool:
+        """执行一次巡检，返回是否检测到异常状态。
+
+        不同页面的 detect() 可以并发；同一页面重复触发直接跳过。
+        处理阶段全局互斥：检查与置位 ``_is_handling`` 之间没有 await，单线程事件循环下即为原子操作。
+        """
         if self._is_handling:
             logger.debug("[PageGuard] 跳过巡检：已在处理中")
-            return
+            return False
+        if page in self._inspecting_pages:
+            return False
 
-        async with self._lock:
-            if self._is_handling:
-                return
+        self._inspecting_pages.add(page)
+        try:
+            self._last_inspection_at[page] = time.monotonic()
+            handler = await self._detect_first_anomaly(page)
+            if handler is None or self._is_handling:
+                return False
 
-            for handler in self.handlers:
-                try:
-                    if await handler.detect(page):
-                        logger.warning(f"[PageGuard] 检测到异常状态: {handler.name}")
-                        self._is_handling = True
-                        self._idle_event.clear()
-                        logger.debug("[PageGuard] _idle_event.clear() - 开始阻塞")
-
-                        try:
-                            await handler.handle(page)
-                            if self._pending_intervention is None:
-                                await self._refresh_context_pages(page, source_handler=handler.name)
-                        except BrowserInterventionRequired as exc:
-                            self._pending_intervention = exc
-                            logger.warning(
-                                f"[PageGuard] 异常状态已转换为 interrupt: {handler.name}"
-                            )
-                        finally:
-                            self._is_handling = False
-                            self._idle_event.set()
-                            logger.debug("[PageGuard] _idle_event.set() - 解除阻塞")
+            try:
+                logger.warning(f"[PageGuard] 检测到异常状态: {handler.name}")
+                self._is_handling = True
+                self._idle_event.clear()
+                logger.debug("[PageGuard] _idle_event.clear() - 开始阻塞")
 
-                        break
-                except Exception as exc:
+                try:
+                    await handler.handle(page)
+                    if self._pending_intervention is None:
+                        await self._refresh_context_pages(page, source_handler=handler.name)
+                except BrowserInterventionRequired as exc:
+                    self._pending_intervention = exc
+                    logger.warning(f"[PageGuard] 异常状态已转换为 interrupt: {handler.name}")
+                finally:
                     self._is_handling = False
                     self._idle_event.set()
-                    logger.error(f"[PageGuard] 处理器 {handler.name} 运行出错: {exc}")
+                    logger.debug("[PageGuard] _idle_event.set() - 解除阻塞")
+            except Exception as exc:
+                self._is_handling = False
+                self._idle_event.set()
+                logger.error(f"[PageGuard] 处理器 {handler.name} 运行出错: {exc}")
+            return True
+        finally:
+            self._inspecting_pages.discard(page)
+
+    async def _detect_first_anomaly(self, page: Page) -> BaseAnomalyHandler | None:
+        """并发执行所有处理器的 detect()，返回命中的最高优先级处理器。
+
+        所有处理器的 DOM 探针合并为一次 ``page.evaluate``，detect() 只消费共享快照。
+        """
+        if not self.handlers:
+            return None
+
+        snapshot = await capture_page_snapshot(page, self._probe_selectors)
+        results = await asyncio.gather(
+            *(handler.detect(page, snapshot) for handler in self.handlers),
+            return_exceptions=True,
+        )
+        for handler, result in zip(self.handlers, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"[PageGuard] 处理器 {handler.name} 运行出错: {result}")
+            elif result:
+                return handler
+        return None
 
     async def _refresh_context_pages(self, page: Page, source_handler: str) -> None:
         try:
@@ -87,74 +178,183 @@ class PageGuard:
         logger.info(
             f"[PageGuard] 异常处理完成（{source_handler}），开始刷新当前 context 全部页面: {len(pages)} 个"
         )
+        alive_pages = []
         for current_page in pages:
             try:
-                if current_page.is_closed():
-                    continue
-                await current_page.reload(wait_until="domcontentloaded", timeout=30000)
+                if not current_page.is_closed():
+                    alive_pages.append(current_page)
             except Exception as exc:
                 logger.debug(f"[PageGuard] 刷新页面失败（忽略）: {exc}")
 
+        # 并发刷新：阻塞时长由最慢的页面决定，而不是所有页面之和
+        results = await asyncio.gather(
+            *(
+                current_page.reload(wait_until="domcontentloaded", timeout=30000)
+                for current_page in alive_pages
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug(f"[PageGuard] 刷新页面失败（忽略）: {result}")
+
+    @property
+    def is_idle(self) -> bool:
+        """没有处理中的异常、也没有待抛出的人工介入时为 True。"""
+        return self._idle_event.is_set() and self._pending_intervention is None
+
     async def wait_until_idle(self) -> None:
-        await self._idle_event.wait()
+        # 空闲是绝大多数情况：直接判断标志，省去再创建一层 Event.wait() 协程
+        if not self._idle_event.is_set():
+            await self._idle_event.wait()
         pending = self._pending_intervention
         if pending is not None:
             self._pending_intervention = None
             raise pending
 
+    async def wait_handlers_settled(self, timeout: float) -> None:
+        """等待导航事件触发的巡检完成（最多 ``timeout`` 秒），再等待 Guard 空闲。
+
+        没有待执行的巡检时立即返回，避免每次页面操作都付出固定的睡眠开销。
+        巡检因 ``_inspection_min_interval_s`` 被推迟时，等待时间顺延到推迟的巡检开始之后。
+        """
+        if self._pending_inspections:
+            start_at = max(handle.when() for handle in self._pending_inspections.values())
+            timeout += max(0.0, start_at - asyncio.get_running_loop().time())
+        await wait_event(self._settled_event, timeout)
+        await self.wait_until_idle()
+
+    def _refresh_settled(self) -> None:
+        if self._pending_inspections or self._inflight_inspections:
+            self._settled_event.clear()
+        else:
+            self._settled_event.set()
+
+    def begin_page_setup(self, page: Page) -> None:
+        """登记新页面正在挂载；需在 context 的 page 事件回调中同步调用。"""
+        self._page_setup_events.setdefault(page, asyncio.Event())
+
+    def finish_page_setup(self, page: Page) -> None:
+        event = self._page_setup_events.pop(page, None)
+        if event is not None:
+            event.set()
+
+    async def wait_page_setup(self, page: Page, timeout: float) -> None:
+        """等待新页面挂载完成（最多 ``timeout`` 秒）；未登记的页面立即返回。"""
+        event = self._page_setup_events.get(page)
+        if event is None:
+            return
+        if not await wait_event(event, timeout):
+            logger.debug("[PageGuard] 等待新页面挂载超时，继续执行")
+
     def attach_to_page(self, page: Page) -> None:
-        try:
-            if getattr(page, "_guard_attached", False):
-                return
-        except Exception:
-            pass
+        if not bind_page_guard(page, self):
+            return
 
-        login_keywords = ["login", "passport", "signin", "member", "auth"]
+        page.on("framenavigated", functools.partial(self._on_frame_navigated, page))
+        page.on("domcontentloaded", functools.partial(self._on_dom_content_loaded, page))
+        self._ensure_polling(page)
 
-        def should_inspect(frame) -> bool:
-            if frame == page.main_frame:
-                return True
-            frame_url = frame.url.lower()
-            return any(keyword in frame_url for keyword in login_keywords)
+    def _on_frame_navigated(self, page: Page, frame) -> None:
+        # 子 frame 导航在 Python 侧即被过滤，只有主 frame 与登录类 iframe 进入调度
+        if _should_inspect_frame(page, frame):
+            self._schedule_inspection(page, "PageGuard.framenavigated_inspection")
+
+    def _on_dom_content_loaded(self, page: Page) -> None:
+        self._schedule_inspection(page, "PageGuard.domcontentloaded_inspection")
+
+    def _schedule_inspection(self, page: Page, task_name: str) -> None:
+        """合并短时间内的巡检请求：每个页面最多保留一个待执行的巡检。
+
+        距上次巡检不足 ``_inspection_min_interval_s`` 时推迟而不是丢弃，
+        保证导航后的最终页面状态一定会被检查到。
+        """
+        self._idle_streak[page] = 0
+        wakeup = self._poll_wakeups.get(page)
+        if wakeup is not None:
+            wakeup.set()
+        if page in self._pending_inspections:
+            return
 
-        try:
-            setattr(page, "_page_guard", self)
-            setattr(page, "_guard_attached", True)
-        except Exception:
-            pass
-
-        page.on(
-            "framenavigated",
-            lambda frame: (
-                create_monitored_task(
-                    self.run_inspection(page),
-                    task_name="PageGuard.framenavigated_inspection",
-                )
-                if should_inspect(frame)
-                else None
-            ),
+        delay = self._inspection_debounce_s
+        last_run = self._last_inspection_at.get(page)
+        if last_run is not None:
+            delay = max(delay, last_run + self._inspection_min_interval_s - time.monotonic())
+
+        loop = asyncio.get_running_loop()
+        self._pending_inspections[page] = loop.call_later(
+            delay, self._start_scheduled_inspection, page, task_name
         )
-        page.on(
-            "domcontentloaded",
-            lambda: create_monitored_task(
-                self.run_inspection(page),
-                task_name="PageGuard.domcontentloaded_inspection",
-            ),
+        self._settled_event.clear()
+
+    def _start_scheduled_inspection(self, page: Page, task_name: str) -> None:
+        self._pending_inspections.pop(page, None)
+        if len(self._inflight_inspections) >= self._max_inflight_inspections:
+            # 丢弃后由轮询兜底：_schedule_inspection 已重置退避并唤醒轮询
+            logger.debug(f"[PageGuard] 巡检任务积压，跳过本次事件巡检: {task_name}")
+            self._refresh_settled()
+            return
+        self.inspect_in_background(page, task_name)
+
+    def inspect_in_background(self, page: Page, task_name: str) -> asyncio.Task:
+        """启动一次后台巡检；任务由 Guard 持有，close() 时统一取消。
+
+        同一页面已有未完成的后台巡检时直接复用，避免重复枚举页面时叠加巡检。
+        """
+        running = self._page_inspection_tasks.get(page)
+        if running is not None and not running.done():
+            return running
+        task = create_monitored_task(self.run_inspection(page), task_name=task_name)
+        self._page_inspection_tasks[page] = task
+        self._inflight_inspections.add(task)
+        self._settled_event.clear()
+        task.add_done_callback(self._on_inspection_done)
+        return task
+
+    def _on_inspection_done(self, task: asyncio.Task) -> None:
+        self._inflight_inspections.discard(task)
+        self._refresh_settled()
+
+    async def close(self) -> None:
+        """取消所有待执行/执行中的巡检与轮询任务，避免页面关闭后残留孤儿任务。"""
+        for handle in list(self._pending_inspections.values()):
+            handle.cancel()
+        self._pending_inspections.clear()
+
+        tasks = [*self._inflight_inspections, *self._poll_tasks.values()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight_inspections.clear()
+        self._refresh_settled()
+
+    def _inspected_recently(self, page: Page) -> bool:
+        if page in self._pending_inspections:
+            return True
+        last_run = self._last_inspection_at.get(page)
+        return last_run is not None and (
+            time.monotonic() - last_run < self._inspection_min_interval_s
         )
-        self._ensure_polling(page)
 
     def _ensure_polling(self, page: Page) -> None:
-        page_id = id(page)
-        task = self._poll_tasks.get(page_id)
+        task = self._poll_tasks.get(page)
         if task and not task.done():
             return
-        self._poll_tasks[page_id] = create_monitored_task(
+        self._poll_tasks[page] = create_monitored_task(
             self._poll_page(page),
             task_name="PageGuard.poll_page",
         )
 
+    def _next_poll_interval(self, page: Page) -> float:
+        """页面静止时按 1s → 2s → 4s … 退避，上限 ``_poll_max_interval_s``。"""
+        idle_rounds = self._idle_streak.get(page, 0) - self._poll_backoff_after
+        if idle_rounds <= 0:
+            return self._poll_interval_s
+        return min(self._poll_interval_s * 2**idle_rounds, self._poll_max_interval_s)
+
     async def _poll_page(self, page: Page) -> None:
-        page_id = id(page)
+        wakeup = self._poll_wakeups.setdefault(page, asyncio.Event())
         try:
             while True:
                 try:
@@ -163,27 +363,32 @@ class PageGuard:
                 except Exception:
                     break
 
-                try:
-                    await self.run_inspection(page)
-                except Exception as exc:
-                    logger.debug(f"[PageGuard] 轮询巡检异常（忽略）: {exc}")
-
-                await asyncio.sleep(self._poll_interval_s)
+                if not self._inspected_recently(page):
+                    try:
+                        detected = await self.run_inspection(page)
+                    except Exception as exc:
+                        detected = False
+                        logger.debug(f"[PageGuard] 轮询巡检异常（忽略）: {exc}")
+                    self._idle_streak[page] = 0 if detected else self._idle_streak.get(page, 0) + 1
+
+                # 退避中的长睡眠可被导航事件提前唤醒，回到 1s 轮询节奏
+                wakeup.clear()
+                await wait_event(wakeup, self._next_poll_interval(page))
         finally:
-            self._poll_tasks.pop(page_id, None)
+            self._poll_tasks.pop(page, None)
+            self._idle_streak.pop(page, None)
+            self._poll_wakeups.pop(page, None)
+            self._last_inspection_at.pop(page, None)
+            pending = self._pending_inspections.pop(page, None)
+            if pending is not None:
+                pending.cancel()
+                self._refresh_settled()
 
 
 async def ensure_guard_idle(page: Page) -> None:
     """确保 Guard 空闲。"""
     try:
-        from .guarded_page import GuardedPage
-
-        if isinstance(page, GuardedPage):
-            guard = object.__getattribute__(page, "_guard")
-            await guard.wait_until_idle()
-            return
-
-        guard = getattr(page, "_page_guard", None)
+        guard = get_page_guard(page)
         if guard is not None:
             await guard.wait_until_idle()
     except Exception as exc:
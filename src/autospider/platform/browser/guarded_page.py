@@ -1,161 +1,392 @@
 """
-Page 代理类模块（__getattribute__ 全方法拦截版）。
+Page 代理类模块（导入时由 ``_install_page_methods`` 按 Page 公开 API 生成代理方法）。
 """
 
 from __future__ import annotations
 
 import asyncio
-import functools
-from typing import TYPE_CHECKING, Any, FrozenSet
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
-from playwright.async_api import Page
+from playwright.async_api import BrowserContext, Keyboard, Page
 
-from .page_handle import wrap_page_with_guard
+from .page_handle import wrap_page_with_guard, wrap_pages_with_guard
 
 if TYPE_CHECKING:
     from .guard import PageGuard
 
+# 代理类的属性访问是热点路径，预先绑定以省去每次的全局与属性查找
+_object_getattribute = object.__getattribute__
+
+_PAGE_SKIP_WAIT: frozenset[str] = frozenset(
+    {
+        "url",
+        "frames",
+        "main_frame",
+        "is_closed",
+        "video",
+        "workers",
+        "request",
+        "viewportSize",
+        "unwrap",
+        "on",
+        "once",
+        "remove_listener",
+        "set_default_timeout",
+        "set_default_navigation_timeout",
+    }
+)
+_PAGE_LOCATOR_FACTORIES: frozenset[str] = frozenset(
+    {
+        "locator",
+        "get_by_role",
+        "get_by_text",
+        "get_by_label",
+        "get_by_placeholder",
+        "get_by_alt_text",
+        "get_by_title",
+        "get_by_test_id",
+        "frame_locator",
+    }
+)
+# 只读的异步查询：不会触发导航，调用后无需等待 Guard 巡检。
+# evaluate/evaluate_handle 可执行任意脚本（包括跳转），不在此列
+_PAGE_READ_ONLY_ASYNC: frozenset[str] = frozenset(
+    {
+        "content",
+        "title",
+        "screenshot",
+        "pdf",
+        "query_selector",
+        "query_selector_all",
+        "inner_text",
+        "inner_html",
+        "text_content",
+        "get_attribute",
+        "is_visible",
+        "is_hidden",
+        "is_checked",
+        "is_disabled",
+        "is_editable",
+        "is_enabled",
+    }
+)
+_LOCATOR_CHAIN_METHODS: frozenset[str] = frozenset(
+    {
+        "locator",
+        "nth",
+        "filter",
+        "and_",
+        "or_",
+        "get_by_role",
+        "get_by_text",
+        "get_by_label",
+        "get_by_placeholder",
+        "get_by_alt_text",
+        "get_by_title",
+        "get_by_test_id",
+    }
+)
+_LOCATOR_CHAIN_PROPERTIES: frozenset[str] = frozenset({"first", "last"})
+_LOCATOR_INTERACTION_METHODS: frozenset[str] = frozenset(
+    {"click", "dblclick", "tap", "check", "uncheck", "select_option", "set_checked"}
+)
+# Locator 上最常用的只读查询：按名字直接判定，省去 iscoroutinefunction 检查
+_LOCATOR_READ_ONLY: frozenset[str] = frozenset(
+    {
+        "count",
+        "all",
+        "all_inner_texts",
+        "all_text_contents",
+        "bounding_box",
+        "inner_html",
+        "inner_text",
+        "text_content",
+        "get_attribute",
+        "input_value",
+        "is_checked",
+        "is_disabled",
+        "is_editable",
+        "is_enabled",
+        "is_hidden",
+        "is_visible",
+        "evaluate",
+        "evaluate_all",
+        "evaluate_handle",
+        "wait_for",
+        "screenshot",
+    }
+)
+# Locator 属性名 -> 分类，由上面的集合一次性合并而成，__getattribute__ 中只需一次字典查找
+_LOCATOR_KIND: dict[str, str] = {
+    **dict.fromkeys(_LOCATOR_READ_ONLY, "read"),
+    **dict.fromkeys(_LOCATOR_CHAIN_METHODS, "chain"),
+    **dict.fromkeys(_LOCATOR_CHAIN_PROPERTIES, "chain_property"),
+    **dict.fromkeys(_LOCATOR_INTERACTION_METHODS, "interaction"),
+    "press": "press",
+}
+# 可能触发提交/导航的按键（Playwright 将 "\n"/"\r" 也映射为 Enter）
+_ENTER_KEYS: frozenset[str] = frozenset(
+    {"Enter", "enter", "ENTER", "Return", "return", "RETURN", "\n", "\r"}
+)
+
+
+class _GuardedCallable:
+    """被代理方法的可调用包装基类；用 __slots__ 对象代替每次访问新建的闭包。"""
+
+    __slots__ = ("_fn", "_guard")
+
+    def __init__(self, fn: Any, guard: "PageGuard"):
+        self._fn = fn
+        self._guard = guard
+
+
+class _GuardedCoro(_GuardedCallable):
+    """协程方法包装：调用前确认没有进行中的接管，调用后等待 Guard 处理完成。"""
+
+    __slots__ = ()
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        guard = self._guard
+        if not guard.is_idle:
+            await guard.wait_until_idle()
+        result = await self._fn(*args, **kwargs)
+        await self._guard.wait_handlers_settled(0.1)
+        return result
 
-class GuardedPage:
-    """Page 动态代理类。"""
-
-    _SKIP_WAIT: FrozenSet[str] = frozenset(
-        {
-            "url",
-            "frames",
-            "main_frame",
-            "is_closed",
-            "video",
-            "workers",
-            "request",
-            "viewportSize",
-            "unwrap",
-            "_page",
-            "_guard",
-            "_SKIP_WAIT",
-            "_LOCATOR_FACTORIES",
-            "on",
-            "once",
-            "remove_listener",
-            "set_default_timeout",
-            "set_default_navigation_timeout",
-        }
-    )
-    _LOCATOR_FACTORIES: FrozenSet[str] = frozenset(
-        {
-            "locator",
-            "get_by_role",
-            "get_by_text",
-            "get_by_label",
-            "get_by_placeholder",
-            "get_by_alt_text",
-            "get_by_title",
-            "get_by_test_id",
-            "frame_locator",
-        }
-    )
 
-    def __init__(self, page: Page, guard: "PageGuard"):
-        object.__setattr__(self, "_page", page)
-        object.__setattr__(self, "_guard", guard)
+class _GuardedPress(_GuardedCoro):
+    """按键包装：仅回车类按键可能触发导航，才等待 Guard。"""
 
-    def __getattribute__(self, name: str) -> Any:
-        if name.startswith("_") or name in ("unwrap",):
-            return object.__getattribute__(self, name)
+    __slots__ = ()
 
-        page = object.__getattribute__(self, "_page")
-        guard = object.__getattribute__(self, "_guard")
-        skip_wait = object.__getattribute__(self, "_SKIP_WAIT")
-        locator_factories = object.__getattribute__(self, "_LOCATOR_FACTORIES")
+    async def __call__(self, key: str, *args: Any, **kwargs: Any) -> None:
+        guard = self._guard
+        if not guard.is_idle:
+            await guard.wait_until_idle()
+        await self._fn(key, *args, **kwargs)
+        if key in _ENTER_KEYS:
+            await self._guard.wait_handlers_settled(0.1)
 
-        if name == "context":
-            return GuardedContext(page.context, guard)
-        if name == "keyboard":
-            return GuardedKeyboard(page.keyboard, guard)
 
-        try:
-            attr = getattr(page, name)
-        except AttributeError as exc:
-            raise AttributeError(
-                f"'{type(self).__name__}' object has no attribute '{name}'"
-            ) from exc
+class _GuardedRead(_GuardedCallable):
+    """只读协程包装：调用前等待 Guard 空闲。"""
+
+    __slots__ = ()
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        await self._guard.wait_until_idle()
+        return await self._fn(*args, **kwargs)
+
+
+class _LocatorFactory(_GuardedCallable):
+    """Locator 工厂包装：返回的 Locator 包装为 GuardedLocator。"""
+
+    __slots__ = ()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> "GuardedLocator":
+        return GuardedLocator(
+            self._fn(*_unwrap_locator_args(args), **_unwrap_locator_kwargs(kwargs)), self._guard
+        )
 
-        if name in skip_wait:
-            return attr
 
-        if name in locator_factories:
+def _unwrap_locator(value: Any) -> Any:
+    return _object_getattribute(value, "_locator") if type(value) is GuardedLocator else value
 
-            @functools.wraps(attr)
-            def locator_factory(*args: Any, **kwargs: Any) -> Any:
-                return GuardedLocator(attr(*args, **kwargs), guard)
 
-            return locator_factory
+def _unwrap_locator_args(args: tuple[Any, ...]) -> tuple[Any, ...]:
+    # 绝大多数链式调用只有标量参数：没有 GuardedLocator 时原样返回，不构造新元组
+    for arg in args:
+        if type(arg) is GuardedLocator:
+            return tuple(map(_unwrap_locator, args))
+    return args
 
-        if asyncio.iscoroutinefunction(attr):
 
-            @functools.wraps(attr)
-            async def guarded_wrapper(*args: Any, **kwargs: Any) -> Any:
-                await guard.wait_until_idle()
-                result = await attr(*args, **kwargs)
-                await asyncio.sleep(0.1)
-                await guard.wait_until_idle()
-                return result
+def _unwrap_locator_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+    # filter(has=...) / locator(has_not=...) 等关键字参数同样可能传入 GuardedLocator
+    for value in kwargs.values():
+        if type(value) is GuardedLocator:
+            return {key: _unwrap_locator(item) for key, item in kwargs.items()}
+    return kwargs
 
-            return guarded_wrapper
 
+class _Forwarded:
+    """转发描述符：直接取被代理对象的同名属性，省去 __getattr__ 的查找失败路径。"""
+
+    __slots__ = ("_name", "_target")
+
+    def __init__(self, target: str, name: str):
+        self._target = target
+        self._name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        return getattr(_object_getattribute(instance, self._target), self._name)
+
+
+def _install_forwarders(cls: type, target: str, api: type) -> None:
+    """为 ``api`` 的公开方法在代理类上预生成转发描述符；代理类自定义的方法保持不变。"""
+    for name in dir(api):
+        if name.startswith("_") or name in cls.__dict__:
+            continue
+        if callable(getattr(api, name, None)):
+            setattr(cls, name, _Forwarded(target, name))
+
+
+class GuardedPage:
+    """Page 代理类。
+
+    Page 的公开协程方法在导入时生成为类方法（见 ``_install_page_methods``），
+    访问走 CPython 常规的方法查找；未生成的属性由 ``__getattr__`` 兜底转发。
+    """
+
+    __slots__ = ("_context_proxy", "_guard", "_keyboard_proxy", "_page")
+
+    def __init__(self, page: Page, guard: "PageGuard"):
+        object.__setattr__(self, "_page", page)
+        object.__setattr__(self, "_guard", guard)
+        object.__setattr__(self, "_context_proxy", None)
+        object.__setattr__(self, "_keyboard_proxy", None)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        try:
+            attr = getattr(self._page, name)
+        except AttributeError as exc:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            ) from exc
+        if name not in _PAGE_SKIP_WAIT and asyncio.iscoroutinefunction(attr):
+            # Page 未声明的协程（动态属性等）：按普通协程方法处理
+            return _GuardedCoro(attr, self._guard)
         return attr
 
     def __setattr__(self, name: str, value: Any) -> None:
         if name.startswith("_"):
             object.__setattr__(self, name, value)
         else:
-            setattr(object.__getattribute__(self, "_page"), name, value)
+            setattr(self._page, name, value)
 
     @property
-    def url(self) -> str:
-        return object.__getattribute__(self, "_page").url
+    def context(self) -> "GuardedContext":
+        # context / keyboard 在 Page 生命周期内不变，代理对象只创建一次
+        proxy = self._context_proxy
+        if proxy is None:
+            proxy = GuardedContext(self._page.context, self._guard)
+            object.__setattr__(self, "_context_proxy", proxy)
+        return proxy
+
+    @property
+    def keyboard(self) -> "GuardedKeyboard":
+        proxy = self._keyboard_proxy
+        if proxy is None:
+            proxy = GuardedKeyboard(self._page.keyboard, self._guard)
+            object.__setattr__(self, "_keyboard_proxy", proxy)
+        return proxy
 
     @property
-    def content(self) -> Any:
-        return object.__getattribute__(self, "_page").content
+    def url(self) -> str:
+        return self._page.url
 
     def is_closed(self) -> bool:
-        return object.__getattribute__(self, "_page").is_closed()
+        return self._page.is_closed()
 
     def unwrap(self) -> Page:
-        return object.__getattribute__(self, "_page")
+        return self._page
+
+
+def _settled_page_method(name: str) -> Callable[..., Any]:
+    async def method(self: GuardedPage, *args: Any, **kwargs: Any) -> Any:
+        # 后台巡检可能在两次调用之间发起接管：空闲时只需一次标志判断，否则等接管结束再操作
+        guard = self._guard
+        if not guard.is_idle:
+            await guard.wait_until_idle()
+        result = await getattr(self._page, name)(*args, **kwargs)
+        await guard.wait_handlers_settled(0.1)
+        return result
+
+    return method
+
+
+def _read_page_method(name: str) -> Callable[..., Any]:
+    async def method(self: GuardedPage, *args: Any, **kwargs: Any) -> Any:
+        guard = self._guard
+        if not guard.is_idle:
+            await guard.wait_until_idle()
+        return await getattr(self._page, name)(*args, **kwargs)
+
+    return method
+
+
+def _locator_factory_page_method(name: str) -> Callable[..., Any]:
+    def method(self: GuardedPage, *args: Any, **kwargs: Any) -> "GuardedLocator":
+        factory = getattr(self._page, name)
+        return GuardedLocator(
+            factory(*_unwrap_locator_args(args), **_unwrap_locator_kwargs(kwargs)), self._guard
+        )
+
+    return method
+
+
+def _install_page_methods() -> None:
+    """按 Page 的公开 API 为 GuardedPage 生成方法：只读查询 / 需等待 Guard / Locator 工厂。"""
+    for name in dir(Page):
+        if name.startswith("_") or name in GuardedPage.__dict__ or name in _PAGE_SKIP_WAIT:
+            continue
+        if name in _PAGE_LOCATOR_FACTORIES:
+            method = _locator_factory_page_method(name)
+        elif not asyncio.iscoroutinefunction(getattr(Page, name, None)):
+            continue
+        elif name in _PAGE_READ_ONLY_ASYNC:
+            method = _read_page_method(name)
+        else:
+            method = _settled_page_method(name)
+        method.__name__ = name
+        method.__qualname__ = f"GuardedPage.{name}"
+        setattr(GuardedPage, name, method)
 
 
 class GuardedContext:
     """BrowserContext 代理类。"""
 
+    __slots__ = ("_context", "_guard")
+
     def __init__(self, context: Any, guard: "PageGuard"):
         object.__setattr__(self, "_context", context)
         object.__setattr__(self, "_guard", guard)
 
     def _wrap_page(self, page: Any) -> Any:
+        if type(page) is GuardedPage:
+            return page
         guard = object.__getattribute__(self, "_guard")
         return wrap_page_with_guard(page, guard)
 
     @property
     def pages(self) -> list["GuardedPage"]:
         context = object.__getattribute__(self, "_context")
-        return [self._wrap_page(page) for page in context.pages]
+        return wrap_pages_with_guard(context.pages, object.__getattribute__(self, "_guard"))
 
     async def wait_for_event(self, event: str, predicate=None, timeout: float = 30000) -> Any:
         context = object.__getattribute__(self, "_context")
         result = await context.wait_for_event(event, predicate=predicate, timeout=timeout)
         if event == "page":
-            await asyncio.sleep(0.1)
+            await self._wait_page_ready(result)
             return self._wrap_page(result)
         return result
 
     async def new_page(self, **kwargs: Any) -> "GuardedPage":
         context = object.__getattribute__(self, "_context")
         page = await context.new_page(**kwargs)
-        await asyncio.sleep(0.1)
+        await self._wait_page_ready(page)
         return self._wrap_page(page)
 
+    async def _wait_page_ready(self, page: Any) -> None:
+        guard = object.__getattribute__(self, "_guard")
+        await guard.wait_page_setup(page, 1.0)
+        await guard.wait_handlers_settled(0.1)
+
     def __getattr__(self, name: str) -> Any:
         return getattr(object.__getattribute__(self, "_context"), name)
 
@@ -163,6 +394,8 @@ class GuardedContext:
 class GuardedKeyboard:
     """Keyboard 代理类。"""
 
+    __slots__ = ("_guard", "_keyboard")
+
     def __init__(self, keyboard: Any, guard: "PageGuard"):
         object.__setattr__(self, "_keyboard", keyboard)
         object.__setattr__(self, "_guard", guard)
@@ -170,10 +403,11 @@ class GuardedKeyboard:
     async def press(self, key: str, **kwargs: Any) -> None:
         keyboard = object.__getattribute__(self, "_keyboard")
         guard = object.__getattribute__(self, "_guard")
-        await keyboard.press(key, **kwargs)
-        if key.lower() in ("enter", "return"):
-            await asyncio.sleep(0.1)
+        if not guard.is_idle:
             await guard.wait_until_idle()
+        await keyboard.press(key, **kwargs)
+        if key in _ENTER_KEYS:
+            await guard.wait_handlers_settled(0.1)
 
     def __getattr__(self, name: str) -> Any:
         return getattr(object.__getattribute__(self, "_keyboard"), name)
@@ -182,26 +416,7 @@ class GuardedKeyboard:
 class GuardedLocator:
     """Locator 代理类。"""
 
-    _CHAIN_METHODS: FrozenSet[str] = frozenset(
-        {
-            "locator",
-            "nth",
-            "filter",
-            "and_",
-            "or_",
-            "get_by_role",
-            "get_by_text",
-            "get_by_label",
-            "get_by_placeholder",
-            "get_by_alt_text",
-            "get_by_title",
-            "get_by_test_id",
-        }
-    )
-    _CHAIN_PROPERTIES: FrozenSet[str] = frozenset({"first", "last"})
-    _INTERACTION_METHODS: FrozenSet[str] = frozenset(
-        {"click", "dblclick", "tap", "check", "uncheck", "select_option", "set_checked"}
-    )
+    __slots__ = ("_guard", "_locator")
 
     def __init__(self, locator: Any, guard: "PageGuard"):
         object.__setattr__(self, "_locator", locator)
@@ -209,13 +424,10 @@ class GuardedLocator:
 
     def __getattribute__(self, name: str) -> Any:
         if name.startswith("_"):
-            return object.__getattribute__(self, name)
+            return _object_getattribute(self, name)
 
-        locator = object.__getattribute__(self, "_locator")
-        guard = object.__getattribute__(self, "_guard")
-        chain_methods = object.__getattribute__(self, "_CHAIN_METHODS")
-        chain_properties = object.__getattribute__(self, "_CHAIN_PROPERTIES")
-        interaction_methods = object.__getattribute__(self, "_INTERACTION_METHODS")
+        locator = _object_getattribute(self, "_locator")
+        guard = _object_getattribute(self, "_guard")
 
         try:
             attr = getattr(locator, name)
@@ -224,59 +436,27 @@ class GuardedLocator:
                 f"'{type(self).__name__}' object has no attribute '{name}'"
             ) from exc
 
-        if name in chain_properties:
+        kind = _LOCATOR_KIND.get(name)
+        if kind is None:
+            kind = "read" if asyncio.iscoroutinefunction(attr) else "sync"
+        if kind == "chain_property":
             return GuardedLocator(attr, guard)
+        if kind == "chain":
+            return _LocatorFactory(attr, guard)
+        if kind == "interaction":
+            return _GuardedCoro(attr, guard)
+        if kind == "press":
+            return _GuardedPress(attr, guard)
+        if kind == "read":
+            # 取属性与发起调用之间没有 await：此刻空闲即可直接返回原方法，省去包装层
+            return attr if guard.is_idle else _GuardedRead(attr, guard)
 
-        if name in chain_methods:
-
-            @functools.wraps(attr)
-            def chain_wrapper(*args: Any, **kwargs: Any) -> Any:
-                processed_args = [
-                    (
-                        object.__getattribute__(arg, "_locator")
-                        if isinstance(arg, GuardedLocator)
-                        else arg
-                    )
-                    for arg in args
-                ]
-                return GuardedLocator(attr(*processed_args, **kwargs), guard)
-
-            return chain_wrapper
-
-        if name in interaction_methods:
-
-            @functools.wraps(attr)
-            async def interaction_wrapper(*args: Any, **kwargs: Any) -> Any:
-                await guard.wait_until_idle()
-                result = await attr(*args, **kwargs)
-                await asyncio.sleep(0.1)
-                await guard.wait_until_idle()
-                return result
-
-            return interaction_wrapper
-
-        if name == "press":
-
-            @functools.wraps(attr)
-            async def press_wrapper(key: str, *args: Any, **kwargs: Any) -> None:
-                await guard.wait_until_idle()
-                await attr(key, *args, **kwargs)
-                if key.lower() in ("enter", "return"):
-                    await asyncio.sleep(0.1)
-                    await guard.wait_until_idle()
-
-            return press_wrapper
-
-        if asyncio.iscoroutinefunction(attr):
-
-            @functools.wraps(attr)
-            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-                await guard.wait_until_idle()
-                return await attr(*args, **kwargs)
+        return attr
 
-            return async_wrapper
 
-        return attr
+_install_page_methods()
+_install_forwarders(GuardedContext, "_context", BrowserContext)
+_install_forwarders(GuardedKeyboard, "_keyboard", Keyboard)
 
 
 __all__ = ["GuardedPage"]
@@ -5,11 +5,17 @@ from .captcha_handler import CaptchaHandler
 from .challenge_handler import ChallengeHandler
 from .login_handler import LoginHandler
 from .rate_limit_handler import RateLimitHandler
+from .snapshot import ElementProbe, PageSnapshot, capture_page_snapshot
+from .takeover import ManualTakeoverHandler
 
 __all__ = [
     "BaseAnomalyHandler",
     "CaptchaHandler",
     "ChallengeHandler",
+    "ElementProbe",
     "LoginHandler",
+    "ManualTakeoverHandler",
+    "PageSnapshot",
     "RateLimitHandler",
+    "capture_page_snapshot",
 ]
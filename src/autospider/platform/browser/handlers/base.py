@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
 
 from playwright.async_api import Page
 
+from .snapshot import PageSnapshot, capture_page_snapshot
+
+# 页面 -> 已通过 expose_function 注册的名称；Playwright 不允许同一页面重复注册同名函数
+_EXPOSED_FUNCTIONS: "weakref.WeakKeyDictionary[Page, set[str]]" = weakref.WeakKeyDictionary()
+
 
 class BaseAnomalyHandler(ABC):
     """异常处理抽象基类。"""
 
     priority: int = 100
     enabled: bool = True
+    # detect() 依赖的 DOM 选择器；PageGuard 会合并所有处理器的选择器，一次 evaluate 采集快照
+    probe_selectors: tuple[str, ...] = ()
 
     @property
     @abstractmethod
@@ -17,9 +28,51 @@ class BaseAnomalyHandler(ABC):
         pass
 
     @abstractmethod
-    async def detect(self, page: Page) -> bool:
+    async def detect(self, page: Page, snapshot: PageSnapshot | None = None) -> bool:
         pass
 
     @abstractmethod
     async def handle(self, page: Page) -> None:
         pass
+
+    async def _resolve_snapshot(self, page: Page, snapshot: PageSnapshot | None) -> PageSnapshot:
+        """未传入共享快照时（如处理器自身的等待循环），单独采集一次。"""
+        if snapshot is not None:
+            return snapshot
+        return await capture_page_snapshot(page, self.probe_selectors)
+
+    async def _evaluate_on_context_pages(
+        self, page: Page, script: str, arg: Any = None
+    ) -> list[tuple[Page, Any]]:
+        """在同一 context 的所有未关闭页面上并发执行脚本。
+
+        单个页面失败时对应结果为异常对象，不影响其他页面。
+        """
+        pages = [current for current in page.context.pages if not current.is_closed()]
+        return await self._evaluate_on_pages(pages, script, arg)
+
+    @staticmethod
+    async def _evaluate_on_pages(
+        pages: list[Page], script: str, arg: Any = None
+    ) -> list[tuple[Page, Any]]:
+        """在给定页面上并发执行脚本；已关闭页面的结果同样是异常对象。"""
+        results = await asyncio.gather(
+            *(current.evaluate(script, arg) for current in pages), return_exceptions=True
+        )
+        return list(zip(pages, results))
+
+    @staticmethod
+    async def _expose_function_on_pages(
+        pages: list[Page], name: str, callback: Callable[..., Any]
+    ) -> None:
+        """在尚未注册 ``name`` 的页面上注册回调；注册失败的页面忽略，由调用方兜底。"""
+        pending = [current for current in pages if name not in _EXPOSED_FUNCTIONS.get(current, ())]
+        if not pending:
+            return
+        results = await asyncio.gather(
+            *(current.expose_function(name, callback) for current in pending),
+            return_exceptions=True,
+        )
+        for current, result in zip(pending, results):
+            if not isinstance(result, BaseException):
+                _EXPOSED_FUNCTIONS.setdefault(current, set()).add(name)
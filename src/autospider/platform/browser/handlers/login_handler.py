@@ -3,21 +3,92 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import json
+import logging
 import os
+import re
+from operator import itemgetter
 from typing import List, Optional, Set
+from urllib.parse import urlparse
 
 from playwright.async_api import Page
+
 from autospider.platform.observability.logger import get_logger
+from autospider.platform.persistence.files.idempotent_io import write_text_if_changed
 
-from .base import BaseAnomalyHandler
 from ..intervention import BrowserInterventionRequired, build_interrupt_payload, interrupts_enabled
-from ..task_utils import create_monitored_task
+from ..task_utils import wait_event
+from .base import BaseAnomalyHandler
+from .snapshot import PageSnapshot, capture_page_snapshot
 
 logger = get_logger(__name__)
 
+# Cookie 名提取在 C 层完成，避免集合推导式逐个元素执行 Python 字节码
+_COOKIE_NAME = itemgetter("name")
+
 _OVERLAY_STYLE = "position:fixed;top:0;left:0;width:100%;z-index:2147483647;font-family:sans-serif;text-align:center;padding:15px;box-shadow:0 4px 12px rgba(0,0,0,0.15);box-sizing:border-box;"
 _BUTTON_STYLE = "margin-left:20px;padding:8px 24px;color:white;background-color:#28a745;border:none;border-radius:5px;cursor:pointer;font-weight:bold;"
 
+# 确认按钮通过 expose_function 回调直接通知 Python 侧，窗口标记仅作注册失败时的兜底
+_CONFIRM_BINDING = "__guard_user_notify__"
+# 横幅脚本为模块级常量，每次调用源码不变（V8 可复用编译结果），动态值经 evaluate 参数传入
+_INJECT_BANNER_JS = f"""
+(waitSeconds) => {{
+    if (!document.body) return false;
+    const old = document.getElementById('__guard_overlay__');
+    if (old) old.remove();
+    window.__guard_user_confirmed__ = false;
+    const div = document.createElement('div');
+    div.id = '__guard_overlay__';
+    div.style.cssText = `{_OVERLAY_STYLE} background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white;`;
+    div.innerHTML = `
+        <span id="__guard_msg__" style="font-size:16px;">
+            🔐 请在下方完成登录操作 | 系统正在自动检测... |
+            <span id="__guard_countdown__">剩余 ${{waitSeconds}} 秒</span>
+        </span>
+        <button id="__guard_confirm_btn__" style="{_BUTTON_STYLE}">✓ 我已完成登录</button>
+    `;
+    document.body.appendChild(div);
+    try {{ document.body.style.marginTop = '60px'; }} catch(e) {{}}
+    document.getElementById('__guard_confirm_btn__').onclick = () => {{
+        window.__guard_user_confirmed__ = true;
+        window.{_CONFIRM_BINDING}?.();
+    }};
+    return true;
+}}
+"""
+_UPDATE_BANNER_JS = """
+(remaining) => {
+    const el = document.getElementById('__guard_countdown__');
+    if (el) el.textContent = `剩余 ${remaining} 秒`;
+    return window.__guard_user_confirmed__ === true;
+}
+"""
+_REMOVE_BANNER_JS = """
+() => {
+    document.getElementById('__guard_overlay__')?.remove();
+    if (document.body) document.body.style.marginTop = '';
+}
+"""
+
+
+@functools.lru_cache(maxsize=64)
+def _login_check_text(url: str) -> str:
+    # 轮询期间反复检查同一批 URL，缓存解析结果，避免每次 urlparse
+    parsed_url = urlparse(url.lower())
+    return f"{parsed_url.netloc}{parsed_url.path}"
+
+
+def _compile_login_url_re(keywords: List[str]) -> re.Pattern[str]:
+    # 与逐个关键词检查 "/kw"、"kw."、".kw" 子串等价（以 "/kw" 结尾的情况已被 "/kw" 覆盖）
+    alternatives = []
+    for keyword in keywords:
+        escaped = re.escape(keyword)
+        alternatives.append(f"/{escaped}|{escaped}\\.|\\.{escaped}")
+    return re.compile("|".join(alternatives) or "(?!)")
+
+
 LOGIN_POPUP_SELECTORS = [
     "iframe[src*='login']",
     "iframe[src*='passport']",
@@ -57,62 +128,70 @@ class LoginHandler(BaseAnomalyHandler):
         auth_cookie_patterns: Optional[List[str]] = None,
         detection_interval: float = 1.0,
         max_wait_time: float = 120.0,
+        max_detection_interval: float = 4.0,
     ):
         if auth_file is None:
             auth_file = os.path.join(os.getcwd(), ".auth", "default.json")
         self.auth_file = auth_file
         self.success_selector = success_selector
-        self.login_keywords = login_url_keywords or ["login", "passport", "signin", "member"]
+        self.probe_selectors = tuple(LOGIN_POPUP_SELECTORS) + (
+            (success_selector,) if success_selector else ()
+        )
+        # URL 检测前统一转小写，关键词也在构造时转小写，否则 "Login" 之类的配置永远匹配不到
+        self.login_keywords = [
+            keyword.lower()
+            for keyword in (login_url_keywords or ["login", "passport", "signin", "member"])
+        ]
+        self._login_url_re = _compile_login_url_re(self.login_keywords)
         self.auth_cookie_patterns = auth_cookie_patterns or self.DEFAULT_AUTH_COOKIE_PATTERNS
+        # 认证 Cookie 名的子串模式合并为单个忽略大小写的正则，新增 Cookie 只需一次扫描，
+        # 也不必逐个 lower() 复制 Cookie 名
+        self._auth_cookie_re = re.compile(
+            "|".join(map(re.escape, self.auth_cookie_patterns)) or "(?!)", re.IGNORECASE
+        )
         self.detection_interval = detection_interval
+        self.max_detection_interval = max(detection_interval, max_detection_interval)
         self.max_wait_time = max_wait_time
         self._initial_cookies: Set[str] = set()
         self._initial_url = ""
-        self._user_confirmed = False
+        self._confirmed = asyncio.Event()
+        # 确认点击或主 frame 导航时置位，提前结束当前轮的等待
+        self._wakeup = asyncio.Event()
+        # 上次写入横幅的倒计时秒数；秒数未变时跳过刷新
+        self._last_countdown = -1
 
     @property
     def name(self) -> str:
         return "人工登录接管"
 
     def _is_login_url(self, url: str) -> bool:
-        from urllib.parse import urlparse
-
-        parsed_url = urlparse(url.lower())
-        check_text = f"{parsed_url.netloc}{parsed_url.path}"
-        for keyword in self.login_keywords:
-            if (
-                f"/{keyword}" in check_text
-                or f"{keyword}." in check_text
-                or f".{keyword}" in check_text
-                or check_text.endswith(f"/{keyword}")
-            ):
-                return True
-        return False
+        return self._login_url_re.search(_login_check_text(url)) is not None
 
-    async def detect(self, page: Page) -> bool:
-        if self._is_login_url(page.url):
-            logger.debug(f"[登录检测] 主页面是登录页: {page.url}")
+    async def detect(self, page: Page, snapshot: PageSnapshot | None = None) -> bool:
+        url = page.url
+        if self._is_login_url(url):
+            logger.debug(f"[登录检测] 主页面是登录页: {url}")
             return True
 
+        main_frame = page.main_frame
         for frame in page.frames:
-            if frame == page.main_frame or not frame.url:
+            if frame is main_frame:
                 continue
-            if self._is_login_url(frame.url):
-                logger.debug(f"[登录检测] 发现登录 iframe: {frame.url}")
+            frame_url = frame.url
+            if frame_url and self._is_login_url(frame_url):
+                logger.debug(f"[登录检测] 发现登录 iframe: {frame_url}")
                 return True
 
+        snapshot = await self._resolve_snapshot(page, snapshot)
         for selector in LOGIN_POPUP_SELECTORS:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible():
-                    logger.debug(f"[登录检测] 发现登录元素: {selector}")
-                    return True
-            except Exception:
-                pass
+            probe = snapshot.probe(selector)
+            if probe is not None and probe.visible:
+                logger.debug(f"[登录检测] 发现登录元素: {selector}")
+                return True
 
-        if self.success_selector:
-            element = await page.query_selector(self.success_selector)
-            if not element or not await element.is_visible():
+        if self.success_selector and snapshot.captured:
+            probe = snapshot.probe(self.success_selector)
+            if probe is None or not probe.visible:
                 logger.debug(f"[登录检测] 成功标识元素不存在: {self.success_selector}")
                 return True
 
@@ -150,27 +229,45 @@ class LoginHandler(BaseAnomalyHandler):
 
     async def _capture_initial_state(self, page: Page) -> None:
         self._initial_url = page.url.lower()
-        self._user_confirmed = False
+        self._confirmed = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._last_countdown = -1
         cookies = await page.context.cookies()
-        self._initial_cookies = {cookie["name"] for cookie in cookies}
+        self._initial_cookies = set(map(_COOKIE_NAME, cookies))
 
     async def _wait_for_login_success(self, page: Page) -> Optional[str]:
-        start_time = asyncio.get_event_loop().time()
         is_iframe_popup_mode = not self._is_login_url(page.url)
         if is_iframe_popup_mode:
             logger.debug("[登录等待] 识别为 iframe 弹窗模式")
 
+        # 主 frame 导航直接唤醒等待，登录后的跳转不必等到下一轮检测
+        on_navigated = self._on_frame_navigated
+        page.on("framenavigated", on_navigated)
+        try:
+            return await self._poll_login_success(page, is_iframe_popup_mode)
+        finally:
+            page.remove_listener("framenavigated", on_navigated)
+
+    async def _poll_login_success(self, page: Page, is_iframe_popup_mode: bool) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_time
+        # 页面无变化时逐步放宽轮询间隔，URL 一旦变化立即回到最小间隔；
+        # 确认按钮回调与导航事件都会置位 _wakeup，不受间隔影响
+        interval = self.detection_interval
+        last_url: Optional[str] = None
         while True:
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed >= self.max_wait_time:
+            now = loop.time()
+            if now >= deadline:
                 logger.warning(f"等待登录超时 ({self.max_wait_time}秒)")
                 return None
 
-            if self._user_confirmed:
+            if self._confirmed.is_set():
                 return "用户点击确认按钮"
 
+            # 本轮的 URL 判定与退避都基于同一次读取
+            current_url = page.url
             if not is_iframe_popup_mode:
-                url_result = await self._check_url_redirect(page)
+                url_result = self._check_url_redirect(current_url)
                 if url_result:
                     cookie_info = await self._check_cookie_change(page)
                     if cookie_info:
@@ -183,21 +280,30 @@ class LoginHandler(BaseAnomalyHandler):
                 if popup_result:
                     return popup_result
 
-            remaining = int(self.max_wait_time - elapsed)
-            await self._update_banner_countdown(page, remaining)
-            await asyncio.sleep(self.detection_interval)
+            if current_url != last_url:
+                interval = self.detection_interval
+                last_url = current_url
+            else:
+                interval = min(interval * 1.5, self.max_detection_interval)
 
-    async def _check_popup_dismissed(self, page: Page) -> Optional[str]:
-        popup_exists = False
-        for selector in LOGIN_POPUP_SELECTORS:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible():
-                    popup_exists = True
-                    break
-            except Exception:
-                pass
+            remaining = int(deadline - now)
+            if await self._update_banner_countdown(page, remaining):
+                self._confirmed.set()
+                continue
+            await wait_event(self._wakeup, interval)
+            self._wakeup.clear()
+
+    def _on_frame_navigated(self, frame) -> None:
+        if frame.parent_frame is None:
+            self._wakeup.set()
 
+    async def _check_popup_dismissed(self, page: Page) -> Optional[str]:
+        # 所有弹窗选择器一次 evaluate 探测，不再逐个 query_selector + is_visible 往返
+        snapshot = await capture_page_snapshot(page, LOGIN_POPUP_SELECTORS, text_limit=0)
+        popup_exists = any(
+            probe is not None and probe.visible
+            for probe in map(snapshot.probe, LOGIN_POPUP_SELECTORS)
+        )
         if popup_exists:
             return None
 
@@ -207,31 +313,34 @@ class LoginHandler(BaseAnomalyHandler):
             return f"登录弹窗消失 + {cookie_info}"
         return None
 
-    async def _check_url_redirect(self, page: Page) -> Optional[str]:
-        current_url = page.url.lower()
+    def _check_url_redirect(self, url: str) -> Optional[str]:
+        current_url = url.lower()
         is_still_login = self._is_login_url(current_url)
-        logger.debug(f"[URL检测] 当前: {current_url[:80]}...")
-        logger.debug(f"[URL检测] 初始: {self._initial_url[:80]}...")
-        logger.debug(
-            f"[URL检测] 仍在登录页: {is_still_login}, URL变化: {current_url != self._initial_url}"
-        )
+        # 每轮都会执行，DEBUG 关闭时跳过切片与格式化
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[URL检测] 当前: %s... 初始: %s... 仍在登录页: %s, URL变化: %s",
+                current_url[:80],
+                self._initial_url[:80],
+                is_still_login,
+                current_url != self._initial_url,
+            )
 
         if not is_still_login and current_url != self._initial_url:
-            logger.info(f"[URL检测] ✓ 检测到离开登录页: {page.url}")
-            return f"URL 重定向到: {page.url}"
+            logger.info(f"[URL检测] ✓ 检测到离开登录页: {url}")
+            return f"URL 重定向到: {url}"
         return None
 
     async def _check_cookie_change(self, page: Page) -> Optional[str]:
         try:
             cookies = await page.context.cookies()
-            current_cookie_names = {cookie["name"] for cookie in cookies}
+            current_cookie_names = set(map(_COOKIE_NAME, cookies))
             new_cookies = current_cookie_names - self._initial_cookies
             if new_cookies:
-                auth_cookies = []
-                for cookie_name in new_cookies:
-                    cookie_lower = cookie_name.lower()
-                    if any(pattern in cookie_lower for pattern in self.auth_cookie_patterns):
-                        auth_cookies.append(cookie_name)
+                auth_cookie_re = self._auth_cookie_re
+                auth_cookies = [
+                    cookie_name for cookie_name in new_cookies if auth_cookie_re.search(cookie_name)
+                ]
                 if auth_cookies:
                     logger.debug(f"检测到新的认证 Cookie: {auth_cookies}")
                     return f"新增认证 Cookie: {', '.join(auth_cookies[:3])}"
@@ -241,108 +350,60 @@ class LoginHandler(BaseAnomalyHandler):
             return None
 
     async def _inject_banner(self, page: Page) -> None:
-        js_code = f"""
-        () => {{
-            if (!document.body) return false;
-            const old = document.getElementById('__guard_overlay__');
-            if (old) old.remove();
-            const div = document.createElement('div');
-            div.id = '__guard_overlay__';
-            div.style.cssText = `{_OVERLAY_STYLE} background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white;`;
-            div.innerHTML = `
-                <span id="__guard_msg__" style="font-size:16px;">
-                    🔐 请在下方完成登录操作 | 系统正在自动检测... |
-                    <span id="__guard_countdown__">剩余 {int(self.max_wait_time)} 秒</span>
-                </span>
-                <button id="__guard_confirm_btn__" style="{_BUTTON_STYLE}">✓ 我已完成登录</button>
-            `;
-            document.body.appendChild(div);
-            try {{ document.body.style.marginTop = '60px'; }} catch(e) {{}}
-            document.getElementById('__guard_confirm_btn__').onclick = () => {{
-                window.__guard_user_confirmed__ = true;
-            }};
-            return true;
-        }}
-        """
         try:
-            for current_page in page.context.pages:
-                if current_page.is_closed():
-                    continue
-                try:
-                    await current_page.evaluate(js_code)
-                except Exception as exc:
-                    logger.debug(f"[横幅] 注入跳过页面 {current_page.url}: {exc}")
+            results = await self._evaluate_on_context_pages(
+                page, _INJECT_BANNER_JS, int(self.max_wait_time)
+            )
         except Exception as exc:
             logger.error(f"[横幅] 遍历页面出错: {exc}")
-
-        create_monitored_task(
-            self._poll_user_confirmation(page),
-            task_name="LoginHandler.poll_user_confirmation",
+            return
+        banner_pages = []
+        for current_page, result in results:
+            if isinstance(result, Exception):
+                logger.debug(f"[横幅] 注入跳过页面 {current_page.url}: {result}")
+            elif result is True:
+                banner_pages.append(current_page)
+        await self._expose_function_on_pages(
+            banner_pages, _CONFIRM_BINDING, self._on_confirm_clicked
         )
 
-    async def _poll_user_confirmation(self, page: Page) -> None:
-        try:
-            while not self._user_confirmed:
-                for current_page in page.context.pages:
-                    if current_page.is_closed():
-                        continue
-                    try:
-                        confirmed = await current_page.evaluate(
-                            "() => window.__guard_user_confirmed__ === true"
-                        )
-                        if confirmed:
-                            self._user_confirmed = True
-                            logger.debug(f"用户点击了确认按钮 (在页面 {current_page.url})")
-                            return
-                    except Exception:
-                        pass
-                await asyncio.sleep(0.5)
-        except Exception:
-            pass
+    def _on_confirm_clicked(self, *_args: object) -> None:
+        logger.debug("用户点击了确认按钮")
+        self._confirmed.set()
+        self._wakeup.set()
 
-    async def _update_banner_countdown(self, page: Page, remaining: int) -> None:
-        js_code = f"""
-        () => {{
-            const el = document.getElementById('__guard_countdown__');
-            if (el) el.textContent = '剩余 {remaining} 秒';
-        }}
+    async def _update_banner_countdown(self, page: Page, remaining: int) -> bool:
+        """刷新倒计时，并顺带返回是否有页面点击了确认按钮。
+
+        秒数与上次相同时不发起 evaluate：确认点击已由 expose_function 回调直接通知，
+        这里的确认标记只是兜底，最多晚一秒读取。
         """
+        if remaining == self._last_countdown:
+            return False
+        self._last_countdown = remaining
         try:
-            for current_page in page.context.pages:
-                if current_page.is_closed():
-                    continue
-                try:
-                    await current_page.evaluate(js_code)
-                except Exception:
-                    pass
+            results = await self._evaluate_on_context_pages(page, _UPDATE_BANNER_JS, remaining)
         except Exception:
-            pass
+            return False
+        for current_page, confirmed in results:
+            if confirmed is True:
+                logger.debug(f"用户点击了确认按钮 (在页面 {current_page.url})")
+                return True
+        return False
 
     async def _remove_banner(self, page: Page) -> None:
-        js_code = """
-        () => {
-            document.getElementById('__guard_overlay__')?.remove();
-            document.body.style.marginTop = '';
-        }
-        """
         try:
-            for current_page in page.context.pages:
-                if current_page.is_closed():
-                    continue
-                try:
-                    await current_page.evaluate(js_code)
-                except Exception:
-                    pass
+            await self._evaluate_on_context_pages(page, _REMOVE_BANNER_JS)
         except Exception:
             pass
 
     async def _save_auth_state(self, page: Page) -> None:
         try:
-            save_dir = os.path.dirname(self.auth_file)
-            if save_dir and not os.path.exists(save_dir):
-                os.makedirs(save_dir)
-            await page.context.storage_state(path=self.auth_file)
-            cookies = await page.context.cookies()
-            logger.info(f">>> 登录状态已保存: {self.auth_file} ({len(cookies)} cookies) <<<")
+            # storage_state 已包含 cookies，无需再调用一次 context.cookies()；
+            # 序列化与写盘（含目录创建）放到工作线程，不阻塞其他页面的事件循环
+            state = await page.context.storage_state()
+            await asyncio.to_thread(write_text_if_changed, self.auth_file, json.dumps(state))
+            cookie_count = len(state.get("cookies") or [])
+            logger.info(f">>> 登录状态已保存: {self.auth_file} ({cookie_count} cookies) <<<")
         except Exception as exc:
             logger.error(f"保存登录状态失败: {exc}")
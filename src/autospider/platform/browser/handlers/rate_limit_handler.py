@@ -6,9 +6,11 @@ import asyncio
 from urllib.parse import urlparse
 
 from playwright.async_api import Page
+
 from autospider.platform.observability.logger import get_logger
 
 from .base import BaseAnomalyHandler
+from .snapshot import PageSnapshot
 
 logger = get_logger(__name__)
 
@@ -33,6 +35,7 @@ RATE_LIMIT_SELECTORS = [
 
 class RateLimitHandler(BaseAnomalyHandler):
     priority = 40
+    probe_selectors = tuple(RATE_LIMIT_SELECTORS)
     _domain_strikes: dict[str, int] = {}
 
     def __init__(
@@ -50,20 +53,18 @@ class RateLimitHandler(BaseAnomalyHandler):
     def name(self) -> str:
         return "频率限制退避"
 
-    async def detect(self, page: Page) -> bool:
+    async def detect(self, page: Page, snapshot: PageSnapshot | None = None) -> bool:
         if page.is_closed():
             return False
         url_lower = (page.url or "").lower()
         if "/429" in url_lower or "too-many-requests" in url_lower:
             return True
+        snapshot = await self._resolve_snapshot(page, snapshot)
         for selector in RATE_LIMIT_SELECTORS:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible():
-                    return True
-            except Exception:
-                continue
-        text = await self._safe_get_page_text(page)
+            probe = snapshot.probe(selector)
+            if probe is not None and probe.visible:
+                return True
+        text = snapshot.body_text
         return bool(text and any(keyword in text for keyword in RATE_LIMIT_KEYWORDS))
 
     async def handle(self, page: Page) -> None:
@@ -86,15 +87,6 @@ class RateLimitHandler(BaseAnomalyHandler):
         )
         await asyncio.sleep(backoff)
 
-    async def _safe_get_page_text(self, page: Page) -> str:
-        try:
-            text = await page.evaluate(
-                "() => document.body ? document.body.innerText.slice(0, 5000) : ''"
-            )
-            return (text or "").lower()
-        except Exception:
-            return ""
-
     def _get_domain(self, url: str) -> str:
         try:
             return urlparse(url).netloc.lower() or "unknown"
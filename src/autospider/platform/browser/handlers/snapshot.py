@@ -0,0 +1,155 @@
+"""异常检测用的页面快照：一次 page.evaluate 采集所有处理器需要的 DOM 探针。"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from playwright.async_api import Page
+
+from autospider.platform.observability.logger import get_logger
+
+logger = get_logger(__name__)
+
+_BODY_TEXT_LIMIT = 5000
+
+# 可见性判断近似 Playwright 的 is_visible（非空包围盒 + visibility 非 hidden）。
+_DESCRIBE_ELEMENT_JS = """
+element => {
+    const rect = element.getBoundingClientRect();
+    const style = window.getComputedStyle(element);
+    return {
+        visible: rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden',
+        width: rect.width,
+        height: rect.height,
+        guard: (element.id || '').trim().startsWith('__guard_'),
+    };
+}
+"""
+
+# 对每个选择器只看第一个匹配元素，与 page.query_selector 语义一致；
+# document.querySelector 解析不了的 Playwright 选择器（text=、xpath=、>> 链等）
+# 放进 unsupported，由 Python 侧回退到 page.query_selector
+_SNAPSHOT_JS = (
+    """
+({ selectors, textLimit }) => {
+    const describe = """
+    + _DESCRIBE_ELEMENT_JS.strip()
+    + """;
+    const probes = {};
+    const unsupported = [];
+    for (const selector of selectors) {
+        let element = null;
+        try {
+            element = document.querySelector(selector);
+        } catch (e) {
+            unsupported.push(selector);
+            continue;
+        }
+        probes[selector] = element ? describe(element) : null;
+    }
+    // 不克隆整棵 DOM：遍历文本节点并跳过 __guard_ 浮层子树，凑够 textLimit 即停止。
+    // script/style 等不可见元素的文本（内联 JS、JSON、CSS）不计入，
+    // 否则 "429" 之类的关键词会误命中脚本内容，脚本也会占满 textLimit
+    const hiddenTags = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE']);
+    let bodyText = '';
+    if (document.body) {
+        const walker = document.createTreeWalker(
+            document.body,
+            NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT,
+            {
+                acceptNode: node => {
+                    if (node.nodeType === Node.TEXT_NODE) return NodeFilter.FILTER_ACCEPT;
+                    if (hiddenTags.has((node.nodeName || '').toUpperCase())) {
+                        return NodeFilter.FILTER_REJECT;
+                    }
+                    return (node.id || '').startsWith('__guard_')
+                        ? NodeFilter.FILTER_REJECT
+                        : NodeFilter.FILTER_SKIP;
+                },
+            },
+        );
+        const parts = [];
+        let length = 0;
+        while (length < textLimit && walker.nextNode()) {
+            const text = walker.currentNode.nodeValue || '';
+            parts.push(text);
+            length += text.length;
+        }
+        bodyText = parts.join('').slice(0, textLimit);
+    }
+    return { probes, unsupported, bodyText };
+}
+"""
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ElementProbe:
+    """选择器第一个匹配元素的可见性信息。"""
+
+    visible: bool
+    width: float = 0.0
+    height: float = 0.0
+    guard: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class PageSnapshot:
+    """一次巡检中所有处理器共享的页面状态。"""
+
+    probes: dict[str, ElementProbe | None] = field(default_factory=dict)
+    body_text: str = ""
+    # evaluate 或选择器回退查询失败（页面关闭/导航中）时为 False，此时"元素不存在"不能作为判定依据
+    captured: bool = True
+
+    def probe(self, selector: str) -> ElementProbe | None:
+        return self.probes.get(selector)
+
+
+async def capture_page_snapshot(
+    page: Page, selectors: Iterable[str], *, text_limit: int = _BODY_TEXT_LIMIT
+) -> PageSnapshot:
+    """单次 CDP 往返采集选择器探针与页面文本（已剔除 __guard_ 浮层，转为小写）。
+
+    只需要探针时传 ``text_limit=0`` 跳过文本采集。
+    """
+    unique_selectors = list(dict.fromkeys(selectors))
+    try:
+        raw = await page.evaluate(
+            _SNAPSHOT_JS,
+            {"selectors": unique_selectors, "textLimit": text_limit},
+        )
+    except Exception as exc:
+        logger.debug(f"[PageSnapshot] 采集页面快照失败（忽略）: {exc}")
+        return PageSnapshot(captured=False)
+
+    raw = raw or {}
+    probes = {selector: _to_probe(item) for selector, item in (raw.get("probes") or {}).items()}
+    captured = True
+    for selector in raw.get("unsupported") or ():
+        try:
+            element = await page.query_selector(selector)
+            probes[selector] = (
+                _to_probe(await element.evaluate(_DESCRIBE_ELEMENT_JS)) if element else None
+            )
+        except Exception as exc:
+            logger.debug(f"[PageSnapshot] 选择器回退查询失败（忽略）: {selector}: {exc}")
+            probes[selector] = None
+            captured = False
+    return PageSnapshot(
+        probes=probes,
+        body_text=(raw.get("bodyText") or "").lower(),
+        captured=captured,
+    )
+
+
+def _to_probe(item: dict | None) -> ElementProbe | None:
+    if not item:
+        return None
+    return ElementProbe(
+        visible=bool(item.get("visible")),
+        width=float(item.get("width") or 0.0),
+        height=float(item.get("height") or 0.0),
+        guard=bool(item.get("guard")),
+    )
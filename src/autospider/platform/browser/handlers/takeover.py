@@ -0,0 +1,194 @@
+"""人工接管类处理器的公共流程：注入确认横幅，等待异常消失、用户确认或超时。"""
+
+from __future__ import annotations
+
+import asyncio
+
+from playwright.async_api import Page
+
+from autospider.platform.observability.logger import get_logger
+
+from ..intervention import BrowserInterventionRequired, build_interrupt_payload, interrupts_enabled
+from ..task_utils import wait_event
+from .base import BaseAnomalyHandler
+
+logger = get_logger(__name__)
+
+# 横幅脚本对所有子类相同（源码不变，V8 可复用编译结果），元素 id 前缀、颜色与文案经 evaluate 参数传入
+_INJECT_BANNER_JS = """
+({ prefix, background, prompt, waitSeconds, notify }) => {
+    if (!document.body) return false;
+    const overlayId = `__guard_${prefix}_overlay__`;
+    document.getElementById(overlayId)?.remove();
+    // 同一文档上次接管留下的确认标记不应让本次接管立即结束
+    window[`__guard_${prefix}_confirmed__`] = false;
+    const div = document.createElement('div');
+    div.id = overlayId;
+    div.style.cssText = 'position:fixed;top:0;left:0;width:100%;z-index:2147483647;'
+        + 'font-family:sans-serif;text-align:center;padding:12px;'
+        + `background:${background};color:#111;box-shadow:0 2px 10px rgba(0,0,0,.25);`;
+    div.innerHTML = `
+        <span>⚠ ${prompt}（剩余 <b id="__guard_${prefix}_countdown__">${waitSeconds}</b> 秒）</span>
+        <button id="__guard_${prefix}_confirm__"
+                style="margin-left:12px;padding:6px 16px;border:0;border-radius:4px;background:#2e7d32;color:#fff;cursor:pointer;">
+            我已完成验证
+        </button>`;
+    document.body.appendChild(div);
+    const btn = document.getElementById(`__guard_${prefix}_confirm__`);
+    if (btn) {
+        btn.onclick = () => {
+            window[`__guard_${prefix}_confirmed__`] = true;
+            window[notify]?.();
+        };
+    }
+    return true;
+}
+"""
+_UPDATE_BANNER_JS = """
+({ prefix, remaining }) => {
+    const el = document.getElementById(`__guard_${prefix}_countdown__`);
+    if (el) el.textContent = String(remaining);
+    return window[`__guard_${prefix}_confirmed__`] === true;
+}
+"""
+_REMOVE_BANNER_JS = "(prefix) => document.getElementById(`__guard_${prefix}_overlay__`)?.remove()"
+
+
+class ManualTakeoverHandler(BaseAnomalyHandler):
+    """需要人工完成验证的处理器基类（验证码、风控挑战等）。
+
+    子类实现 detect() 并声明中断类型与横幅参数；等待循环与横幅脚本由基类统一提供。
+    """
+
+    intervention_type: str = ""
+    intervention_message: str = ""
+    # 横幅元素 id 前缀：__guard_{prefix}_overlay__ / _countdown__ / _confirm__ / _confirmed__
+    banner_prefix: str = ""
+    banner_background: str = "#ff9800"
+    banner_prompt: str = ""
+
+    def __init__(
+        self,
+        detection_interval: float = 0.3,
+        max_wait_time: float = 180.0,
+        max_detection_interval: float = 3.0,
+        clear_after: float = 1.5,
+    ):
+        self.detection_interval = detection_interval
+        self.max_detection_interval = max(detection_interval, max_detection_interval)
+        self.max_wait_time = max_wait_time
+        # 异常特征需持续消失这么久才视为已解除；按时间而非轮询次数判断，
+        # 避免挑战页重绘时的短暂闪烁在短轮询间隔下被误判为已完成
+        self.clear_after = clear_after
+        # 用户点击确认按钮时置位；每次 handle() 在当前事件循环中重新创建
+        self._confirmed = asyncio.Event()
+        # 注入横幅成功的页面；倒计时与确认检查只针对它们，不必每轮枚举 context
+        self._banner_pages: list[Page] = []
+        # 上次写入横幅的倒计时秒数；秒数未变时跳过刷新
+        self._last_countdown = -1
+
+    @property
+    def _notify_binding(self) -> str:
+        return f"__guard_{self.banner_prefix}_notify__"
+
+    async def handle(self, page: Page) -> None:
+        logger.warning(f">>> 触发{self.name}模式 <<<")
+        if interrupts_enabled(page):
+            raise BrowserInterventionRequired(
+                build_interrupt_payload(
+                    page,
+                    intervention_type=self.intervention_type,
+                    handler_name=self.name,
+                    message=self.intervention_message,
+                )
+            )
+        self._confirmed = asyncio.Event()
+        try:
+            await self._inject_banner(page)
+            await self._wait_until_resolved(page)
+        finally:
+            await self._remove_banner(page)
+
+    async def _wait_until_resolved(self, page: Page) -> None:
+        tag = type(self).__name__
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        cleared_since: float | None = None
+        # 持续检测到异常时逐步放宽轮询间隔，状态一旦变化立即回到最小间隔
+        interval = self.detection_interval
+        was_detected = False
+        while True:
+            if self._confirmed.is_set():
+                logger.info(f"[{tag}] 用户确认已完成人工验证")
+                return
+            elapsed = loop.time() - start
+            if elapsed >= self.max_wait_time:
+                logger.warning(f"[{tag}] 等待人工处理超时，继续后续流程")
+                return
+            detected = await self.detect(page)
+            if detected:
+                cleared_since = None
+            else:
+                now = loop.time()
+                if cleared_since is None:
+                    cleared_since = now
+                elif now - cleared_since >= self.clear_after:
+                    logger.info(f"[{tag}] 异常特征已消失，恢复执行")
+                    return
+            if detected and was_detected:
+                interval = min(interval * 1.5, self.max_detection_interval)
+            else:
+                interval = self.detection_interval
+            was_detected = detected
+            remaining = int(self.max_wait_time - elapsed)
+            if await self._update_banner(page, remaining):
+                self._confirmed.set()
+                continue
+            # 确认按钮通过 expose_function 回调直接唤醒等待，无需等到下一轮检测
+            await wait_event(self._confirmed, interval)
+
+    async def _inject_banner(self, page: Page) -> None:
+        arg = {
+            "prefix": self.banner_prefix,
+            "background": self.banner_background,
+            "prompt": self.banner_prompt,
+            "waitSeconds": int(self.max_wait_time),
+            "notify": self._notify_binding,
+        }
+        try:
+            results = await self._evaluate_on_context_pages(page, _INJECT_BANNER_JS, arg)
+        except Exception:
+            results = []
+        self._banner_pages = [current for current, injected in results if injected is True]
+        self._last_countdown = -1
+        await self._expose_notify(self._banner_pages)
+
+    async def _expose_notify(self, pages: list[Page]) -> None:
+        """在横幅页面上注册确认回调；注册失败的页面仍由倒计时脚本轮询确认标记兜底。"""
+        await self._expose_function_on_pages(pages, self._notify_binding, self._on_confirm_clicked)
+
+    def _on_confirm_clicked(self, *_args: object) -> None:
+        self._confirmed.set()
+
+    async def _update_banner(self, page: Page, remaining: int) -> bool:
+        """刷新倒计时，并顺带返回是否有页面点击了确认按钮。
+
+        秒数与上次相同时不发起 evaluate：确认点击已由 expose_function 回调直接通知，
+        这里的确认标记只是兜底，最多晚一秒读取。
+        """
+        if remaining == self._last_countdown:
+            return False
+        self._last_countdown = remaining
+        arg = {"prefix": self.banner_prefix, "remaining": remaining}
+        try:
+            results = await self._evaluate_on_pages(self._banner_pages, _UPDATE_BANNER_JS, arg)
+        except Exception:
+            return False
+        return any(confirmed is True for _, confirmed in results)
+
+    async def _remove_banner(self, page: Page) -> None:
+        self._banner_pages = []
+        try:
+            await self._evaluate_on_context_pages(page, _REMOVE_BANNER_JS, self.banner_prefix)
+        except Exception:
+            pass
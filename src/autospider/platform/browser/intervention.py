@@ -4,6 +4,8 @@ from typing import Any
 
 from playwright.async_api import Page
 
+from .page_handle import get_page_guard as _lookup_page_guard
+
 
 class BrowserInterventionRequired(RuntimeError):
     """Raised when browser automation needs human intervention via graph interrupt."""
@@ -16,7 +18,7 @@ class BrowserInterventionRequired(RuntimeError):
 
 def get_page_guard(page: Page) -> Any | None:
     try:
-        return getattr(page, "_page_guard", None)
+        return _lookup_page_guard(page)
     except Exception:
         return None
 
@@ -3,13 +3,21 @@
 from __future__ import annotations
 
 import asyncio
+import weakref
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, Any
 
-from .task_utils import create_monitored_task
+from playwright.async_api import Page
 
 if TYPE_CHECKING:
     from .guard import PageGuard
 
+# 原始 Page -> PageGuard 的旁路表：不在 Playwright 对象上挂私有属性，页面回收后自动释放
+_PAGE_GUARDS: "weakref.WeakKeyDictionary[Any, PageGuard]" = weakref.WeakKeyDictionary()
+# 原始 Page -> GuardedPage：同一页面重复包装时复用同一代理（及其缓存的 context/keyboard 代理）。
+# 代理强引用页面，弱键无法自动回收，因此在页面 close 事件中移除条目
+_GUARDED_PAGES: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
 
 def _is_guarded_page(page: Any) -> bool:
     from .guarded_page import GuardedPage
@@ -18,6 +26,9 @@ def _is_guarded_page(page: Any) -> bool:
 
 
 def _looks_like_page(page: Any) -> bool:
+    # Playwright 返回的都是具体 Page 实例，先走精确类型比较，鸭子类型检查仅兜底
+    if type(page) is Page:
+        return True
     return all(hasattr(page, name) for name in ("context", "is_closed", "on", "main_frame"))
 
 
@@ -27,9 +38,20 @@ def unwrap_page(page: Any) -> Any:
     return page
 
 
+def bind_page_guard(page: Any, guard: "PageGuard") -> bool:
+    """登记页面所属的 Guard；页面已登记时返回 False。"""
+    if page in _PAGE_GUARDS:
+        return False
+    _PAGE_GUARDS[page] = guard
+    return True
+
+
 def get_page_guard(page: Any) -> "PageGuard | None":
     raw_page = unwrap_page(page)
-    guard = getattr(raw_page, "_page_guard", None)
+    try:
+        guard = _PAGE_GUARDS.get(raw_page)
+    except TypeError:
+        guard = None
     if guard is not None:
         return guard
     if _is_guarded_page(page):
@@ -37,22 +59,45 @@ def get_page_guard(page: Any) -> "PageGuard | None":
     return None
 
 
-def wrap_page_with_guard(page: Any, guard: "PageGuard | None") -> Any:
-    if guard is None or not _looks_like_page(page):
+def _wrap_with_guard(page: Any, guard: "PageGuard", guarded_page_cls: type) -> Any:
+    if isinstance(page, guarded_page_cls) or not _looks_like_page(page):
         return page
-    if _is_guarded_page(page):
+    if page not in _PAGE_GUARDS:
+        guard.attach_to_page(page)
+        guard.inspect_in_background(page, "PageHandle.wrap_page_inspection")
+    wrapper = _GUARDED_PAGES.get(page)
+    if wrapper is not None and object.__getattribute__(wrapper, "_guard") is guard:
+        return wrapper
+    wrapper = guarded_page_cls(page, guard)
+    once = getattr(page, "once", None)
+    if callable(once) and not page.is_closed():
+        if page not in _GUARDED_PAGES:
+            once("close", _forget_guarded_page)
+        _GUARDED_PAGES[page] = wrapper
+    return wrapper
+
+
+def _forget_guarded_page(page: Any) -> None:
+    _GUARDED_PAGES.pop(page, None)
+
+
+def wrap_page_with_guard(page: Any, guard: "PageGuard | None") -> Any:
+    if guard is None:
         return page
 
-    if not getattr(page, "_guard_attached", False):
-        guard.attach_to_page(page)
-        create_monitored_task(
-            guard.run_inspection(page),
-            task_name="PageHandle.wrap_page_inspection",
-        )
+    from .guarded_page import GuardedPage
+
+    return _wrap_with_guard(page, guard, GuardedPage)
+
+
+def wrap_pages_with_guard(pages: Iterable[Any], guard: "PageGuard | None") -> list[Any]:
+    """批量包装页面；已登记的页面只做包装，不再重复挂载与巡检。"""
+    if guard is None:
+        return list(pages)
 
     from .guarded_page import GuardedPage
 
-    return GuardedPage(page, guard)
+    return [_wrap_with_guard(page, guard, GuardedPage) for page in pages]
 
 
 def coerce_guarded_page(page: Any, reference: Any) -> Any:
@@ -68,8 +113,7 @@ def coerce_context_pages(page: Any) -> list[Any]:
     if pages is None:
         return []
 
-    guard = get_page_guard(page)
-    return [wrap_page_with_guard(candidate, guard) for candidate in list(pages)]
+    return wrap_pages_with_guard(list(pages), get_page_guard(page))
 
 
 def pages_match(left: Any, right: Any) -> bool:
@@ -117,6 +161,7 @@ def is_page_closed(page: Any) -> bool:
 
 
 __all__ = [
+    "bind_page_guard",
     "coerce_context_pages",
     "coerce_guarded_page",
     "get_page_guard",
@@ -125,4 +170,5 @@ __all__ = [
     "resolve_previous_page",
     "unwrap_page",
     "wrap_page_with_guard",
+    "wrap_pages_with_guard",
 ]
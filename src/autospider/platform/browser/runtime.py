@@ -4,10 +4,10 @@ from __future__ import annotations
 
 from collections.abc import Mapping
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
-from typing import Any
+from typing import Any, AsyncGenerator
 
 from autospider.platform.config.runtime import config
+
 from .budget import get_browser_budget
 from .composition import build_default_handlers
 from .engine import get_browser_engine, shutdown_browser_engine
@@ -62,9 +62,7 @@ class BrowserRuntimeSession:
 
     @classmethod
     @asynccontextmanager
-    async def from_request(
-        cls, request: Any
-    ) -> AsyncGenerator["BrowserRuntimeSession", None]:
+    async def from_request(cls, request: Any) -> AsyncGenerator["BrowserRuntimeSession", None]:
         session = cls(**cls.build_options(request), close_engine=True)
         try:
             await session.start()
@@ -82,6 +80,8 @@ class BrowserRuntimeSession:
         engine = await get_browser_engine(
             default_headless=self.headless,
             default_timeout=config.browser.timeout_ms,
+            max_pool_size=config.browser.context_pool_size,
+            max_uses_per_context=config.browser.context_max_uses,
         )
         self._page_context = engine.page(
             headless=self.headless,
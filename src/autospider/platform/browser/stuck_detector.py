@@ -9,8 +9,10 @@ StuckDetector 通过维护最近 N 步操作的指纹（action + url + mark_id
 
 from __future__ import annotations
 
+import functools
 import os
 from collections import Counter, deque
+from urllib.parse import urlparse
 
 from autospider.platform.observability.logger import get_logger
 
@@ -20,6 +22,12 @@ _DEFAULT_WINDOW_SIZE = int(os.getenv("STUCK_WINDOW_SIZE", "8"))
 _DEFAULT_REPEAT_THRESHOLD = int(os.getenv("STUCK_REPEAT_THRESHOLD", "3"))
 
 
+@functools.lru_cache(maxsize=64)
+def _url_path(url: str) -> str:
+    # 连续操作通常停留在同一页面，缓存解析结果，避免每步重复 urlparse
+    return urlparse(url).path
+
+
 class StuckDetector:
     """操作指纹滑动窗口卡死检测器。
 
@@ -49,9 +57,7 @@ class StuckDetector:
         指纹格式: "{action}:{url_path}:{mark_id}:{text_prefix}"
         url 只取 path 部分，避免 query 参数变化导致误判。
         """
-        from urllib.parse import urlparse
-
-        url_path = urlparse(url).path if url else ""
+        url_path = _url_path(url) if url else ""
         text_key = (target_text or "")[:30].strip()
         fingerprint = f"{action}:{url_path}:{mark_id}:{text_key}"
         self._window.append(fingerprint)
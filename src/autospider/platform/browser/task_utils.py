@@ -3,8 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import sys
 from collections.abc import Awaitable
 
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as _timeout
+else:  # pragma: no cover - Python 3.10 使用 async-timeout 回退
+    from async_timeout import timeout as _timeout
+
 from autospider.platform.observability.logger import get_logger
 
 logger = get_logger(__name__)
@@ -50,3 +56,18 @@ def create_monitored_task(coro: Awaitable, task_name: str) -> asyncio.Task:
 
     task.add_done_callback(_done_callback)
     return task
+
+
+async def wait_event(event: asyncio.Event, timeout: float) -> bool:
+    """等待事件置位（最多 ``timeout`` 秒），超时返回 False。
+
+    已置位时不挂起；等待用 timeout 上下文，避免 asyncio.wait_for 为单个 future 包一层任务。
+    """
+    if event.is_set():
+        return True
+    try:
+        async with _timeout(timeout):
+            await event.wait()
+    except asyncio.TimeoutError:
+        return False
+    return True
@@ -90,6 +90,12 @@ class BrowserConfig(BaseModel):
     viewport_height: int = Field(default_factory=lambda: int(os.getenv("VIEWPORT_HEIGHT", "720")))
     slow_mo: int = Field(default_factory=lambda: int(os.getenv("SLOW_MO", "0")))
     timeout_ms: int = Field(default_factory=lambda: int(os.getenv("STEP_TIMEOUT_MS", "30000")))
+    context_pool_size: int = Field(
+        default_factory=lambda: int(os.getenv("BROWSER_CONTEXT_POOL_SIZE", "0"))
+    )
+    context_max_uses: int = Field(
+        default_factory=lambda: int(os.getenv("BROWSER_CONTEXT_MAX_USES", "20"))
+    )
 
 
 class AgentConfig(BaseModel):
@@ -364,10 +370,9 @@ class PlannerConfig(BaseModel):
         default_factory=lambda: int(os.getenv("PLANNER_RUNTIME_SUBTASKS_MAX_CHILDREN", "0"))
     )
     runtime_subtasks_use_main_model: bool = Field(
-        default_factory=lambda: os.getenv(
-            "PLANNER_RUNTIME_SUBTASKS_USE_MAIN_MODEL", "false"
-        ).lower()
-        == "true"
+        default_factory=lambda: (
+            os.getenv("PLANNER_RUNTIME_SUBTASKS_USE_MAIN_MODEL", "false").lower() == "true"
+        )
     )
 
 
@@ -0,0 +1,33 @@
+"""事件循环工具：可用时使用 uvloop，否则回退到标准 asyncio。"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - Windows 或未安装 uvloop 时使用标准事件循环
+    uvloop = None
+
+T = TypeVar("T")
+
+
+def is_uvloop_available() -> bool:
+    """当前环境是否可使用 uvloop。"""
+    return uvloop is not None
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """创建新的事件循环；优先 uvloop。"""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """``asyncio.run`` 的替代：在新的事件循环（优先 uvloop）中运行协程直至完成。"""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
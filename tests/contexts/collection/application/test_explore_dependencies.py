@@ -162,12 +162,13 @@ def test_url_collector_uses_injected_explore_dependencies() -> None:
     assert collector.script_generator is deps.script_generator
 
 
-def test_url_collector_requires_script_generator_in_explore_dependencies(
-) -> None:
+def test_url_collector_requires_script_generator_in_explore_dependencies() -> None:
     deps = _build_fake_dependencies(include_script_generator=False)
     output_dir = _workspace_tmp("collector_missing_script_generator")
 
-    with pytest.raises(ValueError, match="collection_explore_dependencies_missing_script_generator"):
+    with pytest.raises(
+        ValueError, match="collection_explore_dependencies_missing_script_generator"
+    ):
         URLCollector(
             page=object(),
             list_url="https://example.com/list",
@@ -193,3 +194,35 @@ def test_config_generator_uses_injected_explore_dependencies() -> None:
     assert generator.decider is deps.decider
     assert generator.xpath_extractor is deps.xpath_extractor
     assert generator.config_persistence is deps.config_persistence
+
+
+def test_url_collector_defers_default_dependencies_and_output_dirs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    built: list[str] = []
+    output_dir = _workspace_tmp("collector_lazy") / "run"
+
+    def _build(*, output_dir: str = "output", skill_runtime=None) -> CollectionExploreDependencies:
+        built.append(output_dir)
+        return _build_fake_dependencies()
+
+    monkeypatch.setattr(
+        "autospider.contexts.collection.application.use_cases.collect_urls."
+        "build_collection_explore_dependencies",
+        _build,
+    )
+
+    collector = URLCollector(
+        page=object(),
+        list_url="https://example.com/list",
+        task_description="collect items",
+        output_dir=str(output_dir),
+    )
+
+    assert built == []
+    assert not collector.screenshots_dir.exists()
+
+    decider = collector.decider
+    assert collector.script_generator is not None
+    assert collector.decider is decider
+    assert built == [str(output_dir)]
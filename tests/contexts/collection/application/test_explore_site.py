@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from autospider.contexts.collection.application.use_cases import explore_site
+
+
+class _FakeDecisionMaker:
+    def __init__(self, decision: dict) -> None:
+        self.decision = decision
+        self.calls = 0
+
+    async def ask_for_decision(self, snapshot, screenshot_base64):
+        del snapshot, screenshot_base64
+        self.calls += 1
+        return self.decision
+
+
+def _patch_scan(monkeypatch: pytest.MonkeyPatch, *, can_scroll: bool) -> list[str]:
+    scans: list[str] = []
+
+    async def _clear_overlay(page) -> None:
+        del page
+
+    async def _inject_and_scan(page):
+        del page
+        scans.append("scan")
+        return object()
+
+    async def _capture(page):
+        del page
+        return b"png", "base64"
+
+    async def _smart_scroll(page) -> bool:
+        del page
+        return can_scroll
+
+    monkeypatch.setattr(explore_site, "clear_overlay", _clear_overlay)
+    monkeypatch.setattr(explore_site, "inject_and_scan", _inject_and_scan)
+    monkeypatch.setattr(explore_site, "capture_screenshot_with_marks", _capture)
+    monkeypatch.setattr(explore_site, "smart_scroll", _smart_scroll)
+    return scans
+
+
+async def _unused_current_detail(explored: int) -> bool:
+    raise AssertionError(f"unexpected current-detail callback: {explored}")
+
+
+async def _unused_click(llm_decision, snapshot) -> bool:
+    raise AssertionError("unexpected click callback")
+
+
+@pytest.mark.asyncio
+async def test_explore_loop_reuses_scan_while_selection_stays_empty(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    scans = _patch_scan(monkeypatch, can_scroll=False)
+    decision_maker = _FakeDecisionMaker(
+        {"action": "select", "args": {"purpose": "detail_links", "items": []}}
+    )
+
+    async def _select(llm_decision, snapshot, screenshot_base64, explored: int) -> int:
+        del llm_decision, snapshot, screenshot_base64
+        return explored
+
+    await explore_site.run_detail_explore_loop(
+        page=object(),
+        screenshots_dir=tmp_path,
+        llm_decision_maker=decision_maker,
+        explore_count=3,
+        on_current_detail=_unused_current_detail,
+        on_select_detail_links=_select,
+        on_click_to_enter=_unused_click,
+    )
+
+    assert scans == ["scan"]
+    assert decision_maker.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_explore_loop_rescans_after_unproductive_selection(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    scans = _patch_scan(monkeypatch, can_scroll=False)
+    decision_maker = _FakeDecisionMaker(
+        {
+            "action": "select",
+            "args": {"purpose": "detail_links", "items": [{"mark_id": 1, "text": "详情"}]},
+        }
+    )
+
+    async def _select(llm_decision, snapshot, screenshot_base64, explored: int) -> int:
+        del llm_decision, snapshot, screenshot_base64
+        return explored
+
+    await explore_site.run_detail_explore_loop(
+        page=object(),
+        screenshots_dir=tmp_path,
+        llm_decision_maker=decision_maker,
+        explore_count=3,
+        on_current_detail=_unused_current_detail,
+        on_select_detail_links=_select,
+        on_click_to_enter=_unused_click,
+    )
+
+    # 选中过元素的轮次可能触碰了页面，下一轮需要重新扫描
+    assert len(scans) == 3
+    assert decision_maker.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_explore_loop_rescans_after_successful_scroll(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    scans = _patch_scan(monkeypatch, can_scroll=True)
+    decision_maker = _FakeDecisionMaker(
+        {"action": "select", "args": {"purpose": "detail_links", "items": []}}
+    )
+
+    async def _select(llm_decision, snapshot, screenshot_base64, explored: int) -> int:
+        del llm_decision, snapshot, screenshot_base64
+        return explored
+
+    await explore_site.run_detail_explore_loop(
+        page=object(),
+        screenshots_dir=tmp_path,
+        llm_decision_maker=decision_maker,
+        explore_count=1,
+        on_current_detail=_unused_current_detail,
+        on_select_detail_links=_select,
+        on_click_to_enter=_unused_click,
+    )
+
+    assert len(scans) == 5
+    assert decision_maker.calls == 5
+
+
+@pytest.mark.asyncio
+async def test_explore_loop_keeps_asking_on_unscrollable_page_until_new_links_appear(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    scans = _patch_scan(monkeypatch, can_scroll=False)
+    decision_maker = _FakeDecisionMaker(
+        {"action": "select", "args": {"purpose": "detail_links", "items": []}}
+    )
+    rounds = 0
+
+    async def _select(llm_decision, snapshot, screenshot_base64, explored: int) -> int:
+        del llm_decision, snapshot, screenshot_base64
+        nonlocal rounds
+        rounds += 1
+        # 第一轮 LLM 只返回已访问过的链接，后续轮次才给出新链接
+        return explored if rounds == 1 else explored + 1
+
+    await explore_site.run_detail_explore_loop(
+        page=object(),
+        screenshots_dir=tmp_path,
+        llm_decision_maker=decision_maker,
+        explore_count=2,
+        on_current_detail=_unused_current_detail,
+        on_select_detail_links=_select,
+        on_click_to_enter=_unused_click,
+    )
+
+    assert len(scans) == 2
+    assert rounds == 3
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from autospider.contexts.collection.infrastructure.crawler.base.base_collector import BaseCollector
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.url = "https://example.com/list?type=1"
+        self.gotos: list[str] = []
+
+    async def goto(self, url: str, **_kwargs) -> None:
+        self.gotos.append(url)
+        self.url = url
+
+
+class _FakePagination:
+    current_page_num = 1
+
+    async def find_and_click_next_page(self) -> bool:
+        return False
+
+
+class _Collector(BaseCollector):
+    async def run(self):
+        raise NotImplementedError
+
+    async def _extract_urls_with_xpath(self) -> bool:
+        return False
+
+
+def _build_collector(tmp_path: Path) -> tuple[_Collector, _FakePage]:
+    page = _FakePage()
+    collector = _Collector(
+        page=page,
+        list_url="https://example.com/list",
+        task_description="collect items",
+        output_dir=str(tmp_path),
+        target_url_count=10,
+        max_pages=1,
+        persist_progress=False,
+    )
+    collector.common_detail_xpath = "//a"
+    collector.pagination_handler = _FakePagination()
+    collector.rate_controller.get_delay = lambda: 0
+    return collector, page
+
+
+@pytest.mark.asyncio
+async def test_xpath_phase_reuses_fresh_list_page_state(tmp_path: Path) -> None:
+    collector, page = _build_collector(tmp_path)
+    collector._mark_list_page_state_fresh()
+    page.url = "https://example.com/list?type=1#top"
+
+    await collector._collect_phase_with_xpath()
+
+    assert page.gotos == []
+
+
+@pytest.mark.asyncio
+async def test_xpath_phase_navigates_when_page_left_fresh_state(tmp_path: Path) -> None:
+    collector, page = _build_collector(tmp_path)
+    collector._mark_list_page_state_fresh()
+    page.url = "https://example.com/detail/1"
+
+    await collector._collect_phase_with_xpath()
+
+    assert page.gotos == ["https://example.com/list"]
+    assert collector._consume_list_page_state_fresh() is False
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from autospider.platform.browser.click_utils import click_and_capture_new_page
+
+
+class _FakeContext:
+    def __init__(self) -> None:
+        self.pages: list[_FakePage] = []
+        self.listeners: dict[str, list] = {}
+
+    def on(self, event: str, handler) -> None:
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event: str, handler) -> None:
+        self.listeners[event].remove(handler)
+
+    def open_page(self) -> "_FakePage":
+        page = _FakePage(self)
+        self.pages.append(page)
+        for handler in list(self.listeners.get("page", [])):
+            handler(page)
+        return page
+
+
+class _FakePage:
+    def __init__(self, context: _FakeContext) -> None:
+        self.context = context
+        self.load_states: list[str] = []
+
+    async def wait_for_load_state(self, state: str, timeout: int) -> None:
+        del timeout
+        self.load_states.append(state)
+
+
+class _FakeLocator:
+    def __init__(self, on_click) -> None:
+        self.on_click = on_click
+
+    async def click(self, timeout: int) -> None:
+        del timeout
+        self.on_click()
+
+
+@pytest.mark.asyncio
+async def test_click_returns_new_page_as_soon_as_context_emits_it() -> None:
+    context = _FakeContext()
+    page = _FakePage(context)
+    context.pages.append(page)
+
+    def _open_later() -> None:
+        asyncio.get_running_loop().call_later(0.01, context.open_page)
+
+    new_page = await asyncio.wait_for(
+        click_and_capture_new_page(
+            page=page,
+            locator=_FakeLocator(_open_later),
+            expect_page_timeout_ms=3000,
+        ),
+        timeout=0.5,
+    )
+
+    assert new_page is context.pages[-1]
+    assert new_page.load_states == ["domcontentloaded"]
+    assert context.listeners["page"] == []
+
+
+@pytest.mark.asyncio
+async def test_click_without_new_page_returns_none_after_timeout() -> None:
+    context = _FakeContext()
+    page = _FakePage(context)
+
+    new_page = await click_and_capture_new_page(
+        page=page,
+        locator=_FakeLocator(lambda: None),
+        expect_page_timeout_ms=20,
+    )
+
+    assert new_page is None
+    assert context.listeners["page"] == []
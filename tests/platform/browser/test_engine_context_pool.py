@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from autospider.platform.browser import engine as engine_module
+from autospider.platform.browser.engine import BrowserEngine
+
+
+class _FakePage:
+    def __init__(self, context: "_FakeContext") -> None:
+        self.context = context
+        self.closed = False
+
+    def set_default_timeout(self, _timeout: int) -> None:
+        return None
+
+    async def close(self) -> None:
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class _FakeContext:
+    def __init__(self, browser: "_FakeBrowser") -> None:
+        self.browser = browser
+        self.pages: list[_FakePage] = []
+        self.closed = False
+        self.listeners: dict[str, list] = {}
+
+    def on(self, event: str, handler) -> None:
+        self.listeners.setdefault(event, []).append(handler)
+
+    async def new_page(self) -> _FakePage:
+        page = _FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.contexts: list[_FakeContext] = []
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def new_context(self, **_options) -> _FakeContext:
+        context = _FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+def _build_engine(monkeypatch: pytest.MonkeyPatch, **kwargs) -> tuple[BrowserEngine, _FakeBrowser]:
+    monkeypatch.setattr(engine_module, "apply_stealth_async", None)
+    engine = BrowserEngine(**kwargs)
+    browser = _FakeBrowser()
+    engine._browser = browser
+
+    async def _ensure_browser(_headless: bool) -> None:
+        return None
+
+    monkeypatch.setattr(engine, "_ensure_browser", _ensure_browser)
+    return engine, browser
+
+
+@pytest.mark.asyncio
+async def test_page_reuses_pooled_context_for_same_options(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine, browser = _build_engine(monkeypatch, max_pool_size=4)
+
+    async with engine.page(enable_guard=False, auto_load_cookie=False) as first:
+        first_context = first.context
+    async with engine.page(enable_guard=False, auto_load_cookie=False) as second:
+        assert second.context is first_context
+
+    assert len(browser.contexts) == 1
+    assert first.closed and second.closed
+    assert not first_context.closed
+
+
+@pytest.mark.asyncio
+async def test_page_recycles_context_after_max_uses(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine, browser = _build_engine(monkeypatch, max_pool_size=4, max_uses_per_context=2)
+
+    for _ in range(3):
+        async with engine.page(enable_guard=False, auto_load_cookie=False):
+            pass
+
+    assert len(browser.contexts) == 2
+    assert browser.contexts[0].closed is True
+    assert browser.contexts[1].closed is False
+
+
+@pytest.mark.asyncio
+async def test_page_without_pool_closes_context(monkeypatch: pytest.MonkeyPatch) -> None:
+    # 复用 context 会把会话状态带给下一位调用方，连接池默认关闭
+    engine, browser = _build_engine(monkeypatch)
+
+    async with engine.page(enable_guard=False, auto_load_cookie=False):
+        pass
+
+    assert browser.contexts[0].closed is True
+
+
+@pytest.mark.asyncio
+async def test_page_caches_parsed_storage_state_until_file_changes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    engine, browser = _build_engine(monkeypatch, max_pool_size=0)
+    auth_file = tmp_path / "auth.json"
+    auth_file.write_text('{"cookies": [], "origins": []}', encoding="utf-8")
+    captured: list[dict] = []
+
+    async def _new_context(**options) -> _FakeContext:
+        captured.append(options["storage_state"])
+        return await original_new_context(**options)
+
+    original_new_context = browser.new_context
+
+    monkeypatch.setattr(browser, "new_context", _new_context)
+
+    for _ in range(2):
+        async with engine.page(auth_file=str(auth_file), enable_guard=False):
+            pass
+    assert captured[0] == {"cookies": [], "origins": []}
+    assert captured[1] is captured[0]
+
+    auth_file.write_text('{"cookies": [{"name": "sid"}], "origins": []}', encoding="utf-8")
+    stat = auth_file.stat()
+    os.utime(auth_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    async with engine.page(auth_file=str(auth_file), enable_guard=False):
+        pass
+    assert captured[2] == {"cookies": [{"name": "sid"}], "origins": []}
+
+
+@pytest.mark.asyncio
+async def test_page_separates_pooled_contexts_by_context_overrides(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine, browser = _build_engine(monkeypatch, max_pool_size=4)
+
+    async with engine.page(enable_guard=False, auto_load_cookie=False):
+        pass
+    async with engine.page(enable_guard=False, auto_load_cookie=False, locale="zh-CN"):
+        pass
+    async with engine.page(enable_guard=False, auto_load_cookie=False, locale="zh-CN"):
+        pass
+
+    assert len(browser.contexts) == 2
+    assert dict(engine._base_context_options)["ignore_https_errors"] is True
+
+
+@pytest.mark.asyncio
+async def test_page_registers_new_page_listener_once_per_pooled_context(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine, browser = _build_engine(monkeypatch, max_pool_size=4)
+    guards = []
+
+    class _FakeGuard:
+        def __init__(self, **_kwargs) -> None:
+            guards.append(self)
+
+        def attach_to_page(self, _page) -> None:
+            return None
+
+        def inspect_in_background(self, _page, _task_name: str) -> None:
+            return None
+
+        async def close(self) -> None:
+            self.closed = True
+
+    monkeypatch.setattr(engine_module, "PageGuard", _FakeGuard)
+
+    for _ in range(3):
+        async with engine.page(auto_load_cookie=False):
+            context = browser.contexts[-1]
+            assert engine._context_guards[context] is guards[-1]
+
+    assert len(browser.contexts) == 1
+    assert len(context.listeners["page"]) == 1
+    assert context not in engine._context_guards
+    assert all(guard.closed for guard in guards)
+
+
+@pytest.mark.asyncio
+async def test_page_closes_context_when_new_page_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine, browser = _build_engine(monkeypatch, max_pool_size=4)
+
+    async def _broken_new_page() -> _FakePage:
+        raise RuntimeError("target crashed")
+
+    async def _new_context(**_options) -> _FakeContext:
+        context = _FakeContext(browser)
+        context.new_page = _broken_new_page
+        browser.contexts.append(context)
+        return context
+
+    monkeypatch.setattr(browser, "new_context", _new_context)
+
+    with pytest.raises(RuntimeError, match="target crashed"):
+        async with engine.page(enable_guard=False, auto_load_cookie=False):
+            pass
+
+    assert browser.contexts[0].closed is True
+    assert engine._context_pool == {}
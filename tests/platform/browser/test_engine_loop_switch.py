@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import signal
+from types import SimpleNamespace
+
+import pytest
+
+from autospider.platform.browser import engine as engine_module
+from autospider.platform.browser.engine import BrowserEngine
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeLauncher:
+    def __init__(self, driver: "_FakeDriver") -> None:
+        self.driver = driver
+
+    async def launch(self, **_kwargs) -> _FakeBrowser:
+        browser = _FakeBrowser()
+        self.driver.browsers.append(browser)
+        return browser
+
+
+class _FakeDriver:
+    def __init__(self) -> None:
+        self.browsers: list[_FakeBrowser] = []
+        self.chromium = _FakeLauncher(self)
+        self.stopped = False
+
+    async def start(self) -> "_FakeDriver":
+        return self
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+    def attach_process(self, pid: int) -> None:
+        # 与 Playwright 实际结构一致：Playwright._connection._transport._proc
+        proc = SimpleNamespace(pid=pid, returncode=None)
+        self._connection = SimpleNamespace(_transport=SimpleNamespace(_proc=proc))
+
+
+def _build_engine(monkeypatch: pytest.MonkeyPatch) -> tuple[BrowserEngine, list[_FakeDriver]]:
+    drivers: list[_FakeDriver] = []
+
+    def _async_playwright() -> _FakeDriver:
+        driver = _FakeDriver()
+        drivers.append(driver)
+        return driver
+
+    monkeypatch.setattr(engine_module, "Stealth", None)
+    monkeypatch.setattr(engine_module, "async_playwright", _async_playwright)
+    return BrowserEngine(), drivers
+
+
+def test_engine_restores_runtime_when_switching_back_to_live_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine, drivers = _build_engine(monkeypatch)
+    first_loop = asyncio.new_event_loop()
+    second_loop = asyncio.new_event_loop()
+    try:
+        first_loop.run_until_complete(engine._ensure_browser(True))
+        first_browser = engine._browser
+        second_loop.run_until_complete(engine._ensure_browser(True))
+        first_loop.run_until_complete(engine._ensure_browser(True))
+    finally:
+        first_loop.close()
+        second_loop.close()
+
+    assert len(drivers) == 2
+    assert engine._browser is first_browser
+    assert first_browser.closed is False
+
+
+def test_engine_close_shuts_down_runtimes_parked_for_other_loops(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine, drivers = _build_engine(monkeypatch)
+    first_loop = asyncio.new_event_loop()
+    second_loop = asyncio.new_event_loop()
+    try:
+        first_loop.run_until_complete(engine._ensure_browser(True))
+        second_loop.run_until_complete(engine._ensure_browser(True))
+        second_loop.run_until_complete(engine.close())
+
+        # 当前 loop 的运行时立即关闭；其他 loop 的运行时投递到所属 loop 上执行
+        assert drivers[1].browsers[0].closed and drivers[1].stopped
+        assert not drivers[0].browsers[0].closed
+        first_loop.run_until_complete(asyncio.sleep(0))
+    finally:
+        first_loop.close()
+        second_loop.close()
+
+    assert drivers[0].browsers[0].closed and drivers[0].stopped
+    assert engine._parked_runtimes == {}
+    assert engine._browser is None
+
+
+def test_engine_drops_runtime_of_closed_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine, drivers = _build_engine(monkeypatch)
+    first_loop = asyncio.new_event_loop()
+    first_loop.run_until_complete(engine._ensure_browser(True))
+    first_loop.close()
+
+    second_loop = asyncio.new_event_loop()
+    try:
+        second_loop.run_until_complete(engine._ensure_browser(True))
+    finally:
+        second_loop.close()
+
+    assert len(drivers) == 2
+    assert engine._browser is drivers[1].browsers[0]
+    assert engine._parked_runtimes == {}
+
+
+def test_engine_kills_driver_process_of_closed_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine, drivers = _build_engine(monkeypatch)
+    killed: list[tuple[int, int]] = []
+    monkeypatch.setattr(engine_module.os, "kill", lambda pid, sig: killed.append((pid, sig)))
+
+    first_loop = asyncio.new_event_loop()
+    second_loop = asyncio.new_event_loop()
+    try:
+        first_loop.run_until_complete(engine._ensure_browser(True))
+        drivers[0].attach_process(4321)
+        second_loop.run_until_complete(engine._ensure_browser(True))
+        drivers[1].attach_process(8765)
+        second_loop.close()
+
+        third_loop = asyncio.new_event_loop()
+        try:
+            first_loop.close()
+            third_loop.run_until_complete(engine.close())
+        finally:
+            third_loop.close()
+    finally:
+        first_loop.close()
+
+    # 两个 loop 都已关闭：暂存的与当前持有的运行时都通过结束驱动进程回收
+    assert sorted(killed) == [(4321, signal.SIGTERM), (8765, signal.SIGTERM)]
+
+
+def test_engine_uses_a_lock_per_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine, _drivers = _build_engine(monkeypatch)
+
+    async def _lock() -> asyncio.Lock:
+        return engine._loop_lock()
+
+    first_loop = asyncio.new_event_loop()
+    second_loop = asyncio.new_event_loop()
+    try:
+        first_lock = first_loop.run_until_complete(_lock())
+        assert first_loop.run_until_complete(_lock()) is first_lock
+        assert second_loop.run_until_complete(_lock()) is not first_lock
+    finally:
+        first_loop.close()
+        second_loop.close()
+
+
+@pytest.mark.asyncio
+async def test_engine_keeps_driver_when_switching_headless(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine, drivers = _build_engine(monkeypatch)
+
+    await engine._ensure_browser(True)
+    await engine._ensure_browser(False)
+
+    assert len(drivers) == 1
+    assert len(drivers[0].browsers) == 2
+    assert drivers[0].browsers[0].closed is True
+
+
+@pytest.mark.asyncio
+async def test_engine_fast_path_skips_lock_for_running_browser(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine, drivers = _build_engine(monkeypatch)
+    await engine._ensure_browser(True)
+
+    async with engine._loop_lock():
+        await asyncio.wait_for(engine._ensure_browser(True), timeout=0.1)
+
+    assert len(drivers[0].browsers) == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_skips_stealth_wrapper_for_non_chromium(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine, drivers = _build_engine(monkeypatch)
+
+    class _UnexpectedStealth:
+        def use_async(self, _driver):
+            raise AssertionError("Stealth should only wrap chromium")
+
+    monkeypatch.setattr(engine_module, "Stealth", _UnexpectedStealth)
+    engine.default_browser_type = "firefox"
+    drivers_firefox = []
+
+    def _async_playwright() -> _FakeDriver:
+        driver = _FakeDriver()
+        driver.firefox = driver.chromium
+        drivers_firefox.append(driver)
+        return driver
+
+    monkeypatch.setattr(engine_module, "async_playwright", _async_playwright)
+
+    await engine._ensure_browser(True)
+
+    assert engine._stealth_context is None
+    assert engine._playwright_started_direct is True
+    assert len(drivers_firefox[0].browsers) == 1
+    assert drivers == []
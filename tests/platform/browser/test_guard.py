@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+
+import pytest
+
+from autospider.platform.browser.guard import (
+    PageGuard,
+    _is_login_frame_url,
+    _should_inspect_frame,
+)
+
+
+class _FakeFrame:
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.main_frame = _FakeFrame("https://example.com/list")
+        self.evaluate_calls: list[dict] = []
+
+    async def evaluate(self, expression: str, arg: dict) -> dict:
+        del expression
+        self.evaluate_calls.append(arg)
+        probes = {
+            selector: {"visible": True, "width": 100, "height": 100}
+            for selector in arg["selectors"]
+        }
+        return {"probes": probes, "bodyText": "Hello"}
+
+
+def test_should_inspect_frame_matches_main_frame_and_login_iframes() -> None:
+    page = _FakePage()
+
+    assert _should_inspect_frame(page, page.main_frame) is True
+    assert _should_inspect_frame(page, _FakeFrame("https://SSO.example.com/Passport/x")) is True
+    assert _should_inspect_frame(page, _FakeFrame("https://ads.example.com/banner")) is False
+    assert _should_inspect_frame(page, _FakeFrame("about:blank")) is False
+    assert _should_inspect_frame(page, _FakeFrame("")) is False
+
+
+def test_login_frame_url_verdict_is_cached() -> None:
+    _is_login_frame_url.cache_clear()
+    page = _FakePage()
+    frame = _FakeFrame("https://ads.example.com/slot?id=1")
+
+    for _ in range(3):
+        assert _should_inspect_frame(page, frame) is False
+
+    info = _is_login_frame_url.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+class _CountingHandler:
+    name = "counting"
+    priority = 0
+    probe_selectors = ()
+
+    def __init__(self) -> None:
+        self.detect_calls = 0
+
+    async def detect(self, page, snapshot=None) -> bool:
+        del page, snapshot
+        self.detect_calls += 1
+        return False
+
+    async def handle(self, page) -> None:
+        del page
+
+
+@pytest.mark.asyncio
+async def test_schedule_inspection_coalesces_event_bursts() -> None:
+    handler = _CountingHandler()
+    guard = PageGuard(handlers=[handler])
+    page = _FakePage()
+
+    for _ in range(10):
+        guard._schedule_inspection(page, "test_inspection")
+    await asyncio.sleep(0.1)
+
+    assert handler.detect_calls == 1
+    assert len(guard._pending_inspections) == 0
+
+
+@pytest.mark.asyncio
+async def test_schedule_inspection_defers_instead_of_dropping_recent_request() -> None:
+    handler = _CountingHandler()
+    guard = PageGuard(handlers=[handler])
+    guard._inspection_min_interval_s = 0.1
+    page = _FakePage()
+
+    await guard.run_inspection(page)
+    guard._schedule_inspection(page, "test_inspection")
+    await asyncio.sleep(0.02)
+    assert handler.detect_calls == 1
+
+    await asyncio.sleep(0.15)
+    assert handler.detect_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_wait_handlers_settled_covers_deferred_inspection() -> None:
+    handler = _CountingHandler()
+    guard = PageGuard(handlers=[handler])
+    guard._inspection_min_interval_s = 0.3
+    page = _FakePage()
+
+    await guard.run_inspection(page)
+    guard._schedule_inspection(page, "test_inspection")
+    await guard.wait_handlers_settled(0.1)
+
+    # 推迟约 0.3s 的巡检也要在 settle 返回前跑完，否则操作会越过导航后的检查
+    assert handler.detect_calls == 2
+    assert len(guard._pending_inspections) == 0
+
+
+class _SlowHandler:
+    probe_selectors = ()
+
+    def __init__(self, name: str, priority: int, hit: bool, delay: float = 0.05) -> None:
+        self.name = name
+        self.priority = priority
+        self.hit = hit
+        self.delay = delay
+        self.handled = False
+
+    async def detect(self, page, snapshot=None) -> bool:
+        del page, snapshot
+        await asyncio.sleep(self.delay)
+        if isinstance(self.hit, Exception):
+            raise self.hit
+        return self.hit
+
+    async def handle(self, page) -> None:
+        del page
+        self.handled = True
+
+
+@pytest.mark.asyncio
+async def test_run_inspection_detects_concurrently_and_handles_highest_priority() -> None:
+    broken = _SlowHandler("broken", 5, RuntimeError("boom"))
+    low = _SlowHandler("low", 40, True)
+    high = _SlowHandler("high", 10, True)
+    idle = _SlowHandler("idle", 20, False)
+    guard = PageGuard(handlers=[low, idle, broken, high])
+    guard._refresh_context_pages = _noop_refresh
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await guard.run_inspection(_FakePage())
+    elapsed = loop.time() - started
+
+    assert elapsed < 0.15
+    assert high.handled is True
+    assert low.handled is False
+
+
+async def _noop_refresh(page, source_handler: str) -> None:
+    del page, source_handler
+
+
+class _SnapshotHandler:
+    priority = 0
+
+    def __init__(self, name: str, probe_selectors: tuple[str, ...]) -> None:
+        self.name = name
+        self.probe_selectors = probe_selectors
+        self.snapshots = []
+
+    async def detect(self, page, snapshot=None) -> bool:
+        del page
+        self.snapshots.append(snapshot)
+        return False
+
+    async def handle(self, page) -> None:
+        del page
+
+
+@pytest.mark.asyncio
+async def test_run_inspection_shares_one_dom_snapshot_across_handlers() -> None:
+    first = _SnapshotHandler("first", ("#a", "#shared"))
+    second = _SnapshotHandler("second", ("#shared", "#b"))
+    guard = PageGuard(handlers=[first, second])
+    page = _FakePage()
+
+    await guard.run_inspection(page)
+
+    assert len(page.evaluate_calls) == 1
+    assert page.evaluate_calls[0]["selectors"] == ["#a", "#shared", "#b"]
+    snapshot = first.snapshots[0]
+    assert snapshot is second.snapshots[0]
+    assert snapshot.probe("#b").visible is True
+    assert snapshot.body_text == "hello"
+
+
+def test_next_poll_interval_backs_off_when_page_stays_idle() -> None:
+    guard = PageGuard()
+    page = _FakePage()
+
+    intervals = []
+    for streak in range(10):
+        guard._idle_streak[page] = streak
+        intervals.append(guard._next_poll_interval(page))
+
+    assert intervals[:4] == [1.0, 1.0, 1.0, 1.0]
+    assert intervals[4:8] == [2.0, 4.0, 8.0, 16.0]
+    assert intervals[8:] == [30.0, 30.0]
+
+
+@pytest.mark.asyncio
+async def test_schedule_inspection_resets_idle_backoff() -> None:
+    guard = PageGuard(handlers=[_CountingHandler()])
+    page = _FakePage()
+    guard._idle_streak[page] = 8
+
+    guard._schedule_inspection(page, "test_inspection")
+
+    assert guard._next_poll_interval(page) == guard._poll_interval_s
+    await asyncio.sleep(0.1)
+
+
+class _ReloadPage:
+    def __init__(self, context, closed: bool = False, error: Exception | None = None) -> None:
+        self.context = context
+        self.closed = closed
+        self.error = error
+        self.reloads = 0
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def reload(self, **_kwargs) -> None:
+        await asyncio.sleep(0.05)
+        self.reloads += 1
+        if self.error is not None:
+            raise self.error
+
+
+class _ReloadContext:
+    def __init__(self) -> None:
+        self.pages: list[_ReloadPage] = []
+
+
+@pytest.mark.asyncio
+async def test_refresh_context_pages_reloads_open_pages_concurrently() -> None:
+    context = _ReloadContext()
+    context.pages = [
+        _ReloadPage(context),
+        _ReloadPage(context, error=RuntimeError("timeout")),
+        _ReloadPage(context, closed=True),
+        _ReloadPage(context),
+    ]
+    guard = PageGuard()
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await guard._refresh_context_pages(context.pages[0], source_handler="test")
+    elapsed = loop.time() - started
+
+    assert elapsed < 0.15
+    assert [page.reloads for page in context.pages] == [1, 1, 0, 1]
+
+
+@pytest.mark.asyncio
+async def test_per_page_state_is_dropped_when_page_is_collected() -> None:
+    guard = PageGuard(handlers=[_CountingHandler()])
+    page = _FakePage()
+
+    await guard.run_inspection(page)
+    assert len(guard._last_inspection_at) == 1
+
+    del page
+    gc.collect()
+    assert len(guard._last_inspection_at) == 0
+
+
+class _BlockingHandler(_CountingHandler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def detect(self, page, snapshot=None) -> bool:
+        await super().detect(page, snapshot)
+        await self.release.wait()
+        return False
+
+
+@pytest.mark.asyncio
+async def test_event_inspections_are_capped_while_inspections_are_backlogged() -> None:
+    handler = _BlockingHandler()
+    guard = PageGuard(handlers=[handler])
+    guard._max_inflight_inspections = 2
+    pages = [_FakePage() for _ in range(5)]
+
+    for page in pages:
+        guard._start_scheduled_inspection(page, "test_inspection")
+    assert len(guard._inflight_inspections) == 2
+
+    handler.release.set()
+    await asyncio.sleep(0.05)
+    assert len(guard._inflight_inspections) == 0
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_outstanding_inspections() -> None:
+    handler = _BlockingHandler()
+    guard = PageGuard(handlers=[handler])
+    first, second = _FakePage(), _FakePage()
+
+    task = guard.inspect_in_background(first, "test_inspection")
+    guard._schedule_inspection(second, "test_inspection")
+    await asyncio.sleep(0)
+
+    await guard.close()
+
+    assert task.cancelled()
+    assert len(guard._inflight_inspections) == 0
+    assert len(guard._pending_inspections) == 0
+    assert guard._idle_event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_run_inspection_detects_pages_concurrently_but_handles_one_anomaly() -> None:
+    handler = _SlowHandler("hit", 10, True)
+    handle_calls = 0
+
+    async def _handle(page) -> None:
+        nonlocal handle_calls
+        del page
+        handle_calls += 1
+        await asyncio.sleep(0.05)
+
+    handler.handle = _handle
+    guard = PageGuard(handlers=[handler])
+    guard._refresh_context_pages = _noop_refresh
+    first, second = _FakePage(), _FakePage()
+
+    results = await asyncio.gather(
+        guard.run_inspection(first),
+        guard.run_inspection(first),
+        guard.run_inspection(second),
+    )
+
+    assert sorted(results) == [False, False, True]
+    assert handle_calls == 1
+    assert guard._idle_event.is_set()
+    assert len(guard._inspecting_pages) == 0
+
+
+@pytest.mark.asyncio
+async def test_wait_handlers_settled_returns_immediately_without_pending_work() -> None:
+    guard = PageGuard(handlers=[_CountingHandler()])
+
+    await asyncio.wait_for(guard.wait_handlers_settled(5.0), timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_wait_handlers_settled_waits_for_scheduled_inspection() -> None:
+    handler = _CountingHandler()
+    guard = PageGuard(handlers=[handler])
+    page = _FakePage()
+
+    guard._schedule_inspection(page, "test_inspection")
+    assert not guard._settled_event.is_set()
+
+    await guard.wait_handlers_settled(1.0)
+
+    assert handler.detect_calls == 1
+    assert guard._settled_event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_wait_page_setup_returns_once_setup_finishes() -> None:
+    guard = PageGuard(handlers=[])
+    page = _FakePage()
+
+    await asyncio.wait_for(guard.wait_page_setup(page, 5.0), timeout=0.05)
+
+    guard.begin_page_setup(page)
+    waiter = asyncio.create_task(guard.wait_page_setup(page, 5.0))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    guard.finish_page_setup(page)
+    await asyncio.wait_for(waiter, timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_inspect_in_background_reuses_running_task_for_same_page() -> None:
+    handler = _BlockingHandler()
+    guard = PageGuard(handlers=[handler])
+    page = _FakePage()
+
+    first = guard.inspect_in_background(page, "test_inspection")
+    second = guard.inspect_in_background(page, "test_inspection")
+
+    assert first is second
+    await guard.close()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from autospider.platform.browser.guard import PageGuard
+from autospider.platform.browser.guarded_page import (
+    GuardedKeyboard,
+    GuardedLocator,
+    GuardedPage,
+)
+
+
+class _FakeLocator:
+    def __init__(self) -> None:
+        self.clicks = 0
+
+    async def click(self) -> None:
+        self.clicks += 1
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.gotos: list[str] = []
+        self.button = _FakeLocator()
+
+    async def goto(self, url: str) -> None:
+        self.gotos.append(url)
+
+    async def title(self) -> str:
+        return "Example"
+
+    def locator(self, selector: str) -> _FakeLocator:
+        del selector
+        return self.button
+
+
+@pytest.mark.asyncio
+async def test_guarded_calls_skip_fixed_sleep_when_guard_is_settled() -> None:
+    page = _FakePage()
+    guarded = GuardedPage(page, PageGuard(handlers=[]))
+
+    async def _drive() -> None:
+        for _ in range(5):
+            await guarded.goto("https://example.com")
+            await guarded.locator("#submit").click()
+
+    await asyncio.wait_for(_drive(), timeout=0.1)
+
+    assert len(page.gotos) == 5
+    assert page.button.clicks == 5
+
+
+def test_guarded_page_exposes_generated_page_methods() -> None:
+    guarded = GuardedPage(_FakePage(), PageGuard(handlers=[]))
+
+    assert "goto" in GuardedPage.__dict__
+    assert "locator" in GuardedPage.__dict__
+    assert guarded.goto.__func__ is GuardedPage.goto
+
+
+class _ReadLocator:
+    async def inner_text(self) -> str:
+        return "ok"
+
+
+@pytest.mark.asyncio
+async def test_locator_reads_skip_wrapper_only_while_guard_is_idle() -> None:
+    guard = PageGuard(handlers=[])
+    raw = _ReadLocator()
+    locator = GuardedLocator(raw, guard)
+
+    assert locator.inner_text == raw.inner_text
+
+    guard._idle_event.clear()
+    wrapped = locator.inner_text
+    assert wrapped != raw.inner_text
+    waiter = asyncio.create_task(wrapped())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    guard._idle_event.set()
+    assert await waiter == "ok"
+
+
+@pytest.mark.asyncio
+async def test_read_only_page_queries_skip_guard_settle() -> None:
+    page = _FakePage()
+    guard = PageGuard(handlers=[])
+    guarded = GuardedPage(page, guard)
+    guard._settled_event.clear()
+
+    assert await asyncio.wait_for(guarded.title(), timeout=0.05) == "Example"
+
+
+def test_guarded_page_reuses_context_and_keyboard_proxies() -> None:
+    page = _FakePage()
+    page.context = object()
+    page.keyboard = object()
+    guarded = GuardedPage(page, PageGuard(handlers=[]))
+
+    assert guarded.context is guarded.context
+    assert guarded.keyboard is guarded.keyboard
+
+
+class _FakeKeyboard:
+    def __init__(self) -> None:
+        self.typed: list[str] = []
+
+    async def type(self, text: str) -> None:
+        self.typed.append(text)
+
+
+@pytest.mark.asyncio
+async def test_guarded_keyboard_forwards_known_methods_without_getattr() -> None:
+    keyboard = _FakeKeyboard()
+    guarded = GuardedKeyboard(keyboard, PageGuard(handlers=[]))
+
+    assert "type" in GuardedKeyboard.__dict__
+    await guarded.type("hello")
+
+    assert keyboard.typed == ["hello"]
+
+
+class _ChainLocator:
+    def __init__(self) -> None:
+        self.calls: list[tuple[tuple, dict]] = []
+
+    def filter(self, *args, **kwargs) -> "_ChainLocator":
+        self.calls.append((args, kwargs))
+        return self
+
+
+@pytest.mark.asyncio
+async def test_locator_chain_unwraps_guarded_locator_args_and_kwargs() -> None:
+    guard = PageGuard(handlers=[])
+    raw = _ChainLocator()
+    inner = _ChainLocator()
+    locator = GuardedLocator(raw, guard)
+
+    assert isinstance(locator.filter(has_text="foo"), GuardedLocator)
+    locator.filter(GuardedLocator(inner, guard), has=GuardedLocator(inner, guard))
+
+    assert raw.calls == [((), {"has_text": "foo"}), ((inner,), {"has": inner})]
+
+
+@pytest.mark.asyncio
+async def test_actions_wait_for_takeover_started_by_background_poll() -> None:
+    page = _FakePage()
+    guard = PageGuard(handlers=[])
+    guarded = GuardedPage(page, guard)
+    keyboard_presses: list[str] = []
+
+    class _Keyboard:
+        async def press(self, key: str) -> None:
+            keyboard_presses.append(key)
+
+    keyboard = GuardedKeyboard(_Keyboard(), guard)
+
+    # 模拟后台巡检已进入验证码接管
+    guard._idle_event.clear()
+    actions = [
+        asyncio.create_task(guarded.goto("https://example.com")),
+        asyncio.create_task(guarded.locator("#submit").click()),
+        asyncio.create_task(keyboard.press("Tab")),
+    ]
+    await asyncio.sleep(0.01)
+    assert page.gotos == []
+    assert page.button.clicks == 0
+    assert keyboard_presses == []
+
+    guard._idle_event.set()
+    await asyncio.wait_for(asyncio.gather(*actions), timeout=1.0)
+    assert page.gotos == ["https://example.com"]
+    assert page.button.clicks == 1
+    assert keyboard_presses == ["Tab"]
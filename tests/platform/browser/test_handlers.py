@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from autospider.platform.browser.handlers import login_handler, takeover
+from autospider.platform.browser.handlers.captcha_handler import CaptchaHandler
+from autospider.platform.browser.handlers.challenge_handler import ChallengeHandler
+from autospider.platform.browser.handlers.login_handler import LoginHandler
+from autospider.platform.browser.handlers.snapshot import ElementProbe, PageSnapshot
+
+
+class _Context:
+    def __init__(self) -> None:
+        self.pages: list[_Page] = []
+
+
+class _Page:
+    def __init__(self, context: _Context, *, closed: bool = False, fail: bool = False) -> None:
+        self.context = context
+        self.closed = closed
+        self.fail = fail
+        self.scripts: list[str] = []
+        self.listeners: dict[str, list] = {}
+        context.pages.append(self)
+
+    def on(self, event: str, callback) -> None:
+        self.listeners.setdefault(event, []).append(callback)
+
+    def remove_listener(self, event: str, callback) -> None:
+        self.listeners[event].remove(callback)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def expose_function(self, name: str, callback) -> None:
+        del name, callback
+
+    async def evaluate(self, script: str, arg=None):
+        await asyncio.sleep(0.05)
+        self.scripts.append(script)
+        if self.fail:
+            raise RuntimeError("target closed")
+        return True
+
+
+@pytest.mark.asyncio
+async def test_banner_scripts_run_concurrently_across_open_pages() -> None:
+    context = _Context()
+    pages = [_Page(context) for _ in range(4)]
+    broken = _Page(context, fail=True)
+    closed = _Page(context, closed=True)
+
+    loop = asyncio.get_running_loop()
+    handler = CaptchaHandler()
+    started = loop.time()
+    await handler._inject_banner(pages[0])
+    elapsed = loop.time() - started
+
+    assert elapsed < 0.15
+    assert all(len(page.scripts) == 1 for page in pages)
+    assert len(broken.scripts) == 1
+    assert closed.scripts == []
+    assert handler._banner_pages == pages
+
+
+@pytest.mark.asyncio
+async def test_banner_updates_reuse_injected_pages() -> None:
+    context = _Context()
+    page = _Page(context)
+    handler = CaptchaHandler()
+    await handler._inject_banner(page)
+
+    late = _Page(context)
+    await handler._update_banner(page, 30)
+    assert len(page.scripts) == 2
+    assert late.scripts == []
+
+    assert await handler._update_banner(page, 30) is False
+    assert len(page.scripts) == 2
+    await handler._update_banner(page, 29)
+    assert len(page.scripts) == 3
+
+    await handler._remove_banner(page)
+    assert handler._banner_pages == []
+
+
+class _DetectPage:
+    def __init__(self, url: str = "https://example.com/list") -> None:
+        self.url = url
+        self.frames: list = []
+
+    def is_closed(self) -> bool:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_captcha_detect_keyword_and_url_matching() -> None:
+    handler = CaptchaHandler()
+    slider = ElementProbe(visible=True, width=40, height=40)
+
+    assert await handler.detect(_DetectPage(), PageSnapshot(body_text="请拖动滑块完成验证"))
+    assert await handler.detect(_DetectPage("https://x.com/Geetest/v4"), PageSnapshot())
+    assert not await handler.detect(_DetectPage(), PageSnapshot(body_text="geetest sdk"))
+    assert await handler.detect(
+        _DetectPage(),
+        PageSnapshot(probes={"[class*='slider']": slider}, body_text="geetest sdk"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_challenge_detect_keyword_and_url_matching() -> None:
+    handler = ChallengeHandler()
+
+    assert await handler.detect(_DetectPage(), PageSnapshot(body_text="checking your browser..."))
+    assert await handler.detect(_DetectPage("https://x.com/cdn-cgi/challenge"), PageSnapshot())
+    assert not await handler.detect(_DetectPage(), PageSnapshot(body_text="商品列表"))
+
+
+@pytest.mark.asyncio
+async def test_wait_loop_backs_off_while_detected_and_stops_on_confirmation(monkeypatch) -> None:
+    delays: list[float] = []
+
+    async def _record_wait(event: asyncio.Event, timeout: float) -> bool:
+        delays.append(timeout)
+        return event.is_set()
+
+    class _StuckCaptcha(CaptchaHandler):
+        banner_updates = 0
+
+        async def detect(self, page, snapshot=None) -> bool:
+            return True
+
+        async def _update_banner(self, page, remaining: int) -> bool:
+            self.banner_updates += 1
+            return self.banner_updates >= 6
+
+    monkeypatch.setattr(takeover, "wait_event", _record_wait)
+    handler = _StuckCaptcha(detection_interval=1.0, max_detection_interval=2.0)
+    await handler._wait_until_resolved(_DetectPage())
+
+    assert handler._confirmed.is_set()
+    assert delays == [1.0, 1.5, 2.0, 2.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_wait_loop_ignores_brief_detection_flicker() -> None:
+    # 挑战页重绘：特征短暂消失两轮又出现，之后才真正解除
+    verdicts = [True, False, False, True]
+
+    class _FlickerCaptcha(CaptchaHandler):
+        calls = 0
+
+        async def detect(self, page, snapshot=None) -> bool:
+            self.calls += 1
+            return verdicts.pop(0) if verdicts else False
+
+        async def _update_banner(self, page, remaining: int) -> bool:
+            return False
+
+    handler = _FlickerCaptcha(detection_interval=0.02, clear_after=0.2)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.wait_for(handler._wait_until_resolved(_DetectPage()), 2.0)
+    elapsed = loop.time() - started
+
+    assert not handler._confirmed.is_set()
+    assert handler.calls > 5
+    assert elapsed >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_login_wait_reads_confirmation_from_countdown_update() -> None:
+    context = _Context()
+    page = _Page(context)
+    page.url = "https://example.com/login"
+    handler = LoginHandler(max_wait_time=5.0)
+    handler._initial_url = page.url
+
+    tasks_before = len(asyncio.all_tasks())
+    reason = await handler._wait_for_login_success(page)
+
+    assert reason == "用户点击确认按钮"
+    assert len(page.scripts) == 1
+    assert len(asyncio.all_tasks()) == tasks_before
+
+
+@pytest.mark.asyncio
+async def test_confirm_binding_wakes_wait_loop_without_next_tick() -> None:
+    class _ExposePage(_DetectPage):
+        def __init__(self) -> None:
+            super().__init__()
+            self.bindings: dict[str, object] = {}
+
+        async def expose_function(self, name: str, callback) -> None:
+            self.bindings[name] = callback
+
+    class _StuckCaptcha(CaptchaHandler):
+        async def detect(self, page, snapshot=None) -> bool:
+            return True
+
+        async def _update_banner(self, page, remaining: int) -> bool:
+            return False
+
+    page = _ExposePage()
+    handler = _StuckCaptcha(detection_interval=30.0)
+    await handler._expose_notify([page])
+    await handler._expose_notify([page])
+    waiter = asyncio.create_task(handler._wait_until_resolved(page))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    page.bindings["__guard_captcha_notify__"]()
+    await asyncio.wait_for(waiter, 1.0)
+    assert len(page.bindings) == 1
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://passport.example.com/", True),
+        ("https://example.com/user/login", True),
+        ("https://example.com/loginpage?next=/", True),
+        ("https://www.example.com/member.html", True),
+        ("https://example.com/Signin/", True),
+        ("https://example.com/list?redirect=/login", False),
+        ("https://bloginfo.example.com/index", False),
+    ],
+)
+def test_login_url_matching(url: str, expected: bool) -> None:
+    assert LoginHandler()._is_login_url(url) is expected
+
+
+def test_login_url_keywords_are_case_insensitive() -> None:
+    handler = LoginHandler(login_url_keywords=["SSO"])
+
+    assert handler.login_keywords == ["sso"]
+    assert handler._is_login_url("https://SSO.example.com/") is True
+
+
+@pytest.mark.asyncio
+async def test_login_cookie_change_reports_only_new_auth_cookies() -> None:
+    class _CookieContext(_Context):
+        def __init__(self) -> None:
+            super().__init__()
+            self.names = ["_ga"]
+
+        async def cookies(self) -> list[dict]:
+            return [{"name": name} for name in self.names]
+
+    context = _CookieContext()
+    page = _Page(context)
+    handler = LoginHandler()
+    handler._initial_cookies = {"_ga"}
+
+    assert await handler._check_cookie_change(page) is None
+    context.names += ["theme", "SESSIONID"]
+    assert await handler._check_cookie_change(page) == "新增认证 Cookie: SESSIONID"
+
+    custom = LoginHandler(auth_cookie_patterns=["AuthKey"])
+    custom._initial_cookies = {"_ga"}
+    context.names = ["_ga", "x_authkey"]
+    assert await custom._check_cookie_change(page) == "新增认证 Cookie: x_authkey"
+
+
+@pytest.mark.asyncio
+async def test_login_confirm_binding_is_exposed_once_per_page() -> None:
+    class _BindingPage(_Page):
+        def __init__(self, context: _Context) -> None:
+            super().__init__(context)
+            self.bindings: dict[str, object] = {}
+
+        async def expose_function(self, name: str, callback) -> None:
+            if name in self.bindings:
+                raise RuntimeError("already registered")
+            self.bindings[name] = callback
+
+    page = _BindingPage(_Context())
+    handler = LoginHandler()
+    await handler._inject_banner(page)
+    await handler._inject_banner(page)
+
+    page.bindings["__guard_user_notify__"]()
+    assert handler._confirmed.is_set()
+
+
+@pytest.mark.asyncio
+async def test_login_popup_check_probes_all_selectors_in_one_evaluate() -> None:
+    class _PopupPage(_Page):
+        def __init__(self, context: _Context, visible: bool) -> None:
+            super().__init__(context)
+            self.visible = visible
+            self.args: list = []
+
+        async def evaluate(self, script: str, arg=None):
+            self.args.append(arg)
+            probe = {"visible": self.visible, "width": 300, "height": 200, "guard": False}
+            return {"probes": {"[class*='login-modal']": probe}, "bodyText": ""}
+
+    handler = LoginHandler()
+    showing = _PopupPage(_Context(), visible=True)
+    assert await handler._check_popup_dismissed(showing) is None
+    assert len(showing.args) == 1
+    assert showing.args[0]["textLimit"] == 0
+
+
+@pytest.mark.asyncio
+async def test_login_wait_backs_off_while_idle_and_resets_on_url_change(monkeypatch) -> None:
+    delays: list[float] = []
+    page = _Page(_Context())
+    page.url = "https://example.com/login"
+
+    async def _record_wait(event: asyncio.Event, timeout: float) -> bool:
+        delays.append(timeout)
+        if len(delays) == 4:
+            page.url = "https://example.com/login?step=2"
+        return event.is_set()
+
+    class _IdleLogin(LoginHandler):
+        banner_updates = 0
+
+        def _check_url_redirect(self, url: str) -> None:
+            return None
+
+        async def _update_banner_countdown(self, page, remaining: int) -> bool:
+            self.banner_updates += 1
+            return self.banner_updates >= 7
+
+    monkeypatch.setattr(login_handler, "wait_event", _record_wait)
+    handler = _IdleLogin(detection_interval=1.0, max_detection_interval=2.0)
+    reason = await handler._wait_for_login_success(page)
+
+    assert reason == "用户点击确认按钮"
+    assert delays == [1.0, 1.5, 2.0, 2.0, 1.0, 1.5]
+
+
+@pytest.mark.asyncio
+async def test_save_auth_state_writes_file_and_reuses_storage_state_cookies(tmp_path) -> None:
+    auth_file = tmp_path / "nested" / ".auth" / "site.json"
+
+    class _StateContext(_Context):
+        cookie_calls = 0
+
+        async def storage_state(self) -> dict:
+            return {"cookies": [{"name": "sid"}], "origins": []}
+
+        async def cookies(self) -> list:
+            self.cookie_calls += 1
+            return []
+
+    context = _StateContext()
+    await LoginHandler(auth_file=str(auth_file))._save_auth_state(_Page(context))
+
+    assert json.loads(auth_file.read_text(encoding="utf-8"))["cookies"] == [{"name": "sid"}]
+    assert context.cookie_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_login_wait_wakes_on_main_frame_navigation() -> None:
+    class _Frame:
+        def __init__(self, parent_frame=None) -> None:
+            self.parent_frame = parent_frame
+
+    class _CookieContext(_Context):
+        async def cookies(self) -> list:
+            return [{"name": "session_id"}]
+
+    class _SilentLogin(LoginHandler):
+        async def _update_banner_countdown(self, page, remaining: int) -> bool:
+            return False
+
+    page = _Page(_CookieContext())
+    page.url = "https://example.com/login"
+    handler = _SilentLogin(detection_interval=30.0)
+    handler._initial_url = page.url
+    waiter = asyncio.create_task(handler._wait_for_login_success(page))
+    await asyncio.sleep(0.01)
+    (on_navigated,) = page.listeners["framenavigated"]
+
+    on_navigated(_Frame(parent_frame=_Frame()))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    page.url = "https://example.com/home"
+    on_navigated(_Frame())
+    reason = await asyncio.wait_for(waiter, 1.0)
+
+    assert reason == "URL 重定向到: https://example.com/home"
+    assert page.listeners["framenavigated"] == []
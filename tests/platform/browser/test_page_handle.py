@@ -4,9 +4,15 @@ import asyncio
 
 import pytest
 
-from autospider.platform.browser import page_handle
 from autospider.platform.browser.guarded_page import GuardedPage
-from autospider.platform.browser.page_handle import coerce_context_pages, resolve_previous_page, unwrap_page
+from autospider.platform.browser.page_handle import (
+    bind_page_guard,
+    coerce_context_pages,
+    get_page_guard,
+    resolve_previous_page,
+    unwrap_page,
+    wrap_pages_with_guard,
+)
 
 
 class _FakeContext:
@@ -27,6 +33,13 @@ class _FakePage:
     def on(self, event: str, handler: object) -> None:
         self._events.setdefault(event, []).append(handler)
 
+    def once(self, event: str, handler: object) -> None:
+        self.on(event, handler)
+
+    def emit(self, event: str) -> None:
+        for handler in self._events.pop(event, []):
+            handler(self)
+
     def is_closed(self) -> bool:
         return self._closed
 
@@ -44,33 +57,27 @@ class _FakeGuard:
     def __init__(self) -> None:
         self.attached: list[str] = []
         self.inspected: list[str] = []
+        self.tasks: list[asyncio.Task] = []
 
     def attach_to_page(self, page: _FakePage) -> None:
-        page._page_guard = self
-        page._guard_attached = True
+        bind_page_guard(page, self)
         self.attached.append(page.name)
 
     async def run_inspection(self, page: _FakePage) -> None:
         self.inspected.append(page.name)
 
+    def inspect_in_background(self, page: _FakePage, task_name: str) -> asyncio.Task:
+        del task_name
+        task = asyncio.create_task(self.run_inspection(page))
+        self.tasks.append(task)
+        return task
+
     async def wait_until_idle(self) -> None:
         return None
 
 
 @pytest.mark.asyncio
-async def test_coerce_context_pages_wraps_raw_context_pages(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    scheduled: list[asyncio.Task] = []
-
-    def _create_task(coro, task_name: str):
-        del task_name
-        task = asyncio.create_task(coro)
-        scheduled.append(task)
-        return task
-
-    monkeypatch.setattr(page_handle, "create_monitored_task", _create_task)
-
+async def test_coerce_context_pages_wraps_raw_context_pages() -> None:
     context = _FakeContext()
     current = _FakePage("current", context)
     sibling = _FakePage("sibling", context)
@@ -81,30 +88,18 @@ async def test_coerce_context_pages_wraps_raw_context_pages(
     guarded_current = GuardedPage(current, guard)
 
     pages = coerce_context_pages(guarded_current)
-    await asyncio.gather(*scheduled)
+    await asyncio.gather(*guard.tasks)
 
     assert len(pages) == 2
     assert all(isinstance(page, GuardedPage) for page in pages)
     assert unwrap_page(pages[0]) is current
     assert unwrap_page(pages[1]) is sibling
-    assert sibling._page_guard is guard
+    assert get_page_guard(sibling) is guard
     assert "sibling" in guard.inspected
 
 
 @pytest.mark.asyncio
-async def test_resolve_previous_page_wraps_raw_opener(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    scheduled: list[asyncio.Task] = []
-
-    def _create_task(coro, task_name: str):
-        del task_name
-        task = asyncio.create_task(coro)
-        scheduled.append(task)
-        return task
-
-    monkeypatch.setattr(page_handle, "create_monitored_task", _create_task)
-
+async def test_resolve_previous_page_wraps_raw_opener() -> None:
     context = _FakeContext()
     parent = _FakePage("parent", context)
     current = _FakePage("current", context)
@@ -116,9 +111,52 @@ async def test_resolve_previous_page_wraps_raw_opener(
     guarded_current = GuardedPage(current, guard)
 
     previous_page = await resolve_previous_page(guarded_current)
-    await asyncio.gather(*scheduled)
+    await asyncio.gather(*guard.tasks)
 
     assert isinstance(previous_page, GuardedPage)
     assert unwrap_page(previous_page) is parent
-    assert parent._page_guard is guard
+    assert get_page_guard(parent) is guard
     assert "parent" in guard.inspected
+
+
+def test_bind_page_guard_registers_each_page_once() -> None:
+    context = _FakeContext()
+    page = _FakePage("current", context)
+    first, second = _FakeGuard(), _FakeGuard()
+
+    assert bind_page_guard(page, first) is True
+    assert bind_page_guard(page, second) is False
+    assert get_page_guard(page) is first
+    assert get_page_guard(GuardedPage(page, second)) is first
+    assert not hasattr(page, "_page_guard")
+
+
+@pytest.mark.asyncio
+async def test_wrap_pages_with_guard_attaches_only_new_pages() -> None:
+    context = _FakeContext()
+    known = _FakePage("known", context)
+    fresh = _FakePage("fresh", context)
+    guard = _FakeGuard()
+    guard.attach_to_page(known)
+
+    pages = wrap_pages_with_guard([known, fresh], guard)
+    await asyncio.gather(*guard.tasks)
+
+    assert [unwrap_page(page) for page in pages] == [known, fresh]
+    assert guard.attached == ["known", "fresh"]
+    assert guard.inspected == ["fresh"]
+
+
+def test_wrapping_reuses_guarded_page_until_close() -> None:
+    context = _FakeContext()
+    page = _FakePage("page", context)
+    guard = _FakeGuard()
+    guard.attach_to_page(page)
+
+    first = wrap_pages_with_guard([page], guard)[0]
+    assert wrap_pages_with_guard([page], guard)[0] is first
+    assert wrap_pages_with_guard([page], _FakeGuard())[0] is not first
+
+    page._closed = True
+    page.emit("close")
+    assert wrap_pages_with_guard([page], guard)[0] is not first
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from autospider.platform.browser.handlers.login_handler import LoginHandler
+from autospider.platform.browser.handlers.rate_limit_handler import RateLimitHandler
+from autospider.platform.browser.handlers.snapshot import (
+    _SNAPSHOT_JS,
+    PageSnapshot,
+    capture_page_snapshot,
+)
+
+# 没有浏览器时用最小 DOM 替身在 node 中执行快照脚本：
+# 只实现脚本用到的 TreeWalker 语义（先序遍历，FILTER_REJECT 跳过整棵子树，FILTER_SKIP 继续深入）
+_DOM_STUB_JS = """
+const Node = { ELEMENT_NODE: 1, TEXT_NODE: 3 };
+const NodeFilter = { SHOW_ELEMENT: 1, SHOW_TEXT: 4, FILTER_ACCEPT: 1, FILTER_REJECT: 2, FILTER_SKIP: 3 };
+const el = (nodeName, children = [], id = '') => ({ nodeType: 1, nodeName, id, children });
+const text = value => ({ nodeType: 3, nodeValue: value, children: [] });
+const document = {
+    body: el('BODY', TREE),
+    // 与浏览器一致：非 CSS 语法（Playwright 的 text=、>> 链等）直接抛错
+    querySelector: selector => {
+        if (selector.includes('=') || selector.includes('>>')) throw new SyntaxError(selector);
+        return null;
+    },
+    createTreeWalker(root, _show, filter) {
+        const queue = [];
+        const visit = node => {
+            for (const child of node.children) {
+                const verdict = filter.acceptNode(child);
+                if (verdict === NodeFilter.FILTER_ACCEPT) queue.push(child);
+                if (verdict !== NodeFilter.FILTER_REJECT) visit(child);
+            }
+        };
+        visit(root);
+        const walker = {
+            currentNode: root,
+            nextNode() {
+                walker.currentNode = queue.shift() || null;
+                return walker.currentNode;
+            },
+        };
+        return walker;
+    },
+};
+const window = {};
+console.log(JSON.stringify((SNAPSHOT)(ARG)));
+"""
+
+
+def _run_snapshot_js(
+    tree_js: str, text_limit: int = 5000, selectors: list[str] | None = None
+) -> dict:
+    script = (
+        _DOM_STUB_JS.replace("TREE", tree_js)
+        .replace("SNAPSHOT", _SNAPSHOT_JS)
+        .replace("ARG", json.dumps({"selectors": selectors or [], "textLimit": text_limit}))
+    )
+    completed = subprocess.run(
+        ["node", "-e", script], capture_output=True, text=True, check=True, timeout=30
+    )
+    return json.loads(completed.stdout)
+
+
+class _Page:
+    url = "https://example.com/list"
+
+    def is_closed(self) -> bool:
+        return False
+
+
+class _Element:
+    async def evaluate(self, script: str) -> dict:
+        del script
+        return {"visible": True, "width": 80.0, "height": 20.0, "guard": False}
+
+
+class _PlaywrightSelectorPage(_Page):
+    """evaluate 只认 CSS，其余选择器需要走 query_selector。"""
+
+    def __init__(self, present: set[str]) -> None:
+        self.present = present
+        self.main_frame = object()
+        self.frames = [self.main_frame]
+        self.queried: list[str] = []
+
+    async def evaluate(self, script: str, arg: dict) -> dict:
+        del script
+        unsupported = [s for s in arg["selectors"] if "=" in s and not s.startswith("[")]
+        probes = {s: None for s in arg["selectors"] if s not in unsupported}
+        return {"probes": probes, "unsupported": unsupported, "bodyText": ""}
+
+    async def query_selector(self, selector: str) -> _Element | None:
+        self.queried.append(selector)
+        return _Element() if selector in self.present else None
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="需要 node 执行快照脚本")
+@pytest.mark.asyncio
+async def test_snapshot_text_skips_script_and_style_content() -> None:
+    result = _run_snapshot_js(
+        """[
+            el('SCRIPT', [text('window.__STATE__ = {"code": 429, "pad": "' + 'x'.repeat(80) + '"}')]),
+            el('STYLE', [text('.status-429 { color: red }')]),
+            el('DIV', [text('商品列表 '), el('SPAN', [text('第 1 页')])]),
+            el('NOSCRIPT', [text('rate limit')]),
+            el('DIV', [text('确认')], '__guard_overlay__'),
+        ]""",
+        text_limit=20,
+    )
+
+    assert result["bodyText"] == "商品列表 第 1 页"
+    snapshot = PageSnapshot(body_text=result["bodyText"].lower())
+    assert await RateLimitHandler().detect(_Page(), snapshot) is False
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="需要 node 执行快照脚本")
+def test_snapshot_js_reports_selectors_query_selector_cannot_parse() -> None:
+    result = _run_snapshot_js("[]", selectors=["#user", "text=退出登录", "#nav >> text=我的"])
+
+    assert result["probes"] == {"#user": None}
+    assert result["unsupported"] == ["text=退出登录", "#nav >> text=我的"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_falls_back_to_query_selector_for_playwright_selectors() -> None:
+    page = _PlaywrightSelectorPage(present={"text=退出登录"})
+
+    snapshot = await capture_page_snapshot(page, ["#user", "text=退出登录", "xpath=//nav"])
+
+    assert page.queried == ["text=退出登录", "xpath=//nav"]
+    assert snapshot.probe("#user") is None
+    assert snapshot.probe("text=退出登录").visible is True
+    assert snapshot.probe("xpath=//nav") is None
+    assert snapshot.captured is True
+
+
+@pytest.mark.asyncio
+async def test_login_detect_accepts_text_engine_success_selector() -> None:
+    handler = LoginHandler(success_selector="text=退出登录")
+
+    assert await handler.detect(_PlaywrightSelectorPage(present={"text=退出登录"})) is False
+    assert await handler.detect(_PlaywrightSelectorPage(present=set())) is True
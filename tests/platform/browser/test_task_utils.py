@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from autospider.platform.browser.task_utils import wait_event
+
+
+@pytest.mark.asyncio
+async def test_wait_event_returns_when_set_and_reports_timeout() -> None:
+    event = asyncio.Event()
+    assert await wait_event(event, 0.01) is False
+
+    asyncio.get_running_loop().call_later(0.01, event.set)
+    assert await wait_event(event, 1.0) is True
+    assert await wait_event(event, 0) is True
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+
+from autospider.platform.shared_kernel.utils import event_loop
+
+
+def test_run_executes_coroutine_on_fresh_loop() -> None:
+    async def _answer() -> int:
+        await asyncio.sleep(0)
+        return 42
+
+    assert event_loop.run(_answer()) == 42
+
+
+def test_new_event_loop_matches_uvloop_availability() -> None:
+    loop = event_loop.new_event_loop()
+    try:
+        is_uvloop = type(loop).__module__.startswith("uvloop")
+        assert is_uvloop is event_loop.is_uvloop_available()
+    finally:
+        loop.close()